@@ -1,7 +1,7 @@
 import os
 import shutil
 import time
-from simvue_fds.connector import FDSRun
+from local_alerts import FDSRun
 
 timestamp = int(time.time())
 
@@ -10,5 +10,6 @@ with FDSRun() as run:
 
     run.load(
         results_dir="example_results",
-        slice_parse_quantity = "SOOT VISIBILITY"
+        slice_parse_enabled=True,
+        slice_parse_quantities=["SOOT VISIBILITY"],
     )
@@ -1,6 +1,6 @@
 import os
 import shutil
-from simvue_fds.connector import FDSRun
+from local_alerts import FDSRun
 
 # Delete old results directory, if present
 if os.path.exists("/workdir/results_no_vents"):
@@ -45,6 +45,7 @@ with FDSRun() as run:
         fds_input_file_path="/workdir/input_no_vents.fds",
         workdir_path="results_no_vents",
         clean_workdir=True,
-        slice_parse_quantity = "SOOT VISIBILITY",
+        slice_parse_enabled=True,
+        slice_parse_quantities=["SOOT VISIBILITY"],
 
     )
@@ -1,7 +1,7 @@
 import os
 import shutil
 import time
-from simvue_fds.connector import FDSRun
+from local_alerts import FDSRun
 
 timestamp = int(time.time())
 
@@ -48,5 +48,6 @@ with FDSRun() as run:
         fds_input_file_path="/workdir/input_with_vents.fds",
         workdir_path="results_with_vents",
         clean_workdir=True,
-        slice_parse_quantity = "SOOT VISIBILITY",
+        slice_parse_enabled=True,
+        slice_parse_quantities=["SOOT VISIBILITY"],
     )
@@ -0,0 +1,351 @@
+import logging
+import os
+from datetime import datetime, timezone
+import fdsreader
+import fdsreader.utils.fortran_data as fdtype
+import numpy
+import semver
+import simvue_fds.connector
+from fdsreader.slcf.slice import SubSlice
+from simvue_fds.helpers import create_obst_mask
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of frames of a slice read into memory at once
+FRAMES_PER_READ = 50
+
+
+class SliceStream:
+    """Read the frames appended to the files of a 2D slice since the last read
+
+    The files of each mesh which the slice cuts through are memory-mapped from
+    the end of the last frame read, so only new frames are read from disk, and
+    these are placed onto a single grid for the whole slice in the same way as
+    'simvue_fds.helpers.create_heterogeneous_slice'.
+    """
+
+    def __init__(self, slice, root_path):
+        self.slice = slice
+        self.coords = slice.get_coordinates()
+        self.n_read = 0
+
+        dims = slice.extent_dirs
+        self.shape = (len(self.coords[dims[0]]), len(self.coords[dims[1]]))
+
+        if not (metric_name := slice.id):
+            # Will name it {quantity}.{axis}.{value}
+            quantity = slice.quantity.quantity.replace(" ", "_").lower()
+            axis = next(ax for ax in ("x", "y", "z") if ax not in dims)
+            value = str(round(self.coords[axis][0], 3)).replace(".", "_")
+            metric_name = f"{quantity}.{axis}.{value}"
+        self.metric_name = metric_name
+
+        self._subslices = []
+        for subslice in slice.subslices:
+            sub_coords = subslice.get_coordinates()
+            start_idx = []
+            insert_indices = []
+            for dim in dims:
+                start_idx.append(
+                    numpy.where(self.coords[dim] == sub_coords[dim][0])[0][0]
+                )
+                end_idx = numpy.where(self.coords[dim] == sub_coords[dim][-1])[0][0]
+                insert_indices.append(
+                    numpy.searchsorted(
+                        sub_coords[dim], self.coords[dim][start_idx[-1] : end_idx + 1]
+                    )
+                )
+
+            # Each frame is a record holding the time followed by a record of values
+            n_values = subslice.dimension.size(cell_centered=False)
+            frame_dtype = fdtype.combine(fdtype.FLOAT, fdtype.new((("f", n_values),)))
+
+            self._subslices.append(
+                {
+                    "file_path": os.path.join(root_path, subslice.filename),
+                    "frame_dtype": frame_dtype,
+                    "file_shape": subslice.dimension.shape(cell_centered=False),
+                    "shape": subslice.shape,
+                    "start_idx": start_idx,
+                    "insert_indices": insert_indices,
+                }
+            )
+
+    def _n_frames(self, subslice):
+        try:
+            file_size = os.stat(subslice["file_path"]).st_size
+        except FileNotFoundError:
+            return 0
+        return (file_size - SubSlice._offset) // subslice["frame_dtype"].itemsize
+
+    def n_available(self):
+        """Return the number of frames written for every mesh but not yet read"""
+        return min(map(self._n_frames, self._subslices)) - self.n_read
+
+    def read(self, max_frames=FRAMES_PER_READ):
+        """Return the times and values of the next frames written since the last read
+
+        Only frames which have been completely written for every mesh are read, and
+        at most 'max_frames' are read at once to limit the memory used.
+        """
+        n_frames = min(self.n_available(), max_frames)
+        if n_frames <= 0:
+            return numpy.empty(0), numpy.empty((0, *self.shape))
+
+        values = numpy.zeros((n_frames, *self.shape))
+        for subslice in self._subslices:
+            frame_dtype = subslice["frame_dtype"]
+            frames = numpy.memmap(
+                subslice["file_path"],
+                dtype=frame_dtype,
+                mode="r",
+                offset=SubSlice._offset + self.n_read * frame_dtype.itemsize,
+                shape=(n_frames,),
+            )
+            if subslice is self._subslices[0]:
+                times = frames[frame_dtype.names[1]].astype(float).ravel()
+
+            # Values are written in Fortran order, with ghost points for cell
+            # centred slices, so reorder the axes of every frame at once
+            n_axes = len(subslice["file_shape"])
+            subslice_vals = (
+                frames[frame_dtype.names[4]]
+                .reshape((n_frames, *subslice["file_shape"][::-1]))
+                .transpose(0, *range(n_axes, 0, -1))
+            )
+            if self.slice.cell_centered:
+                subslice_vals = subslice_vals[:, 1:, 1:]
+            subslice_vals = subslice_vals.reshape((n_frames, *subslice["shape"]))
+
+            insert_indices = subslice["insert_indices"]
+            subslice_expanded = subslice_vals[
+                :, insert_indices[0][:, None], insert_indices[1][None, :]
+            ]
+            start_idx = subslice["start_idx"]
+            values[
+                :,
+                start_idx[0] : start_idx[0] + subslice_expanded.shape[1],
+                start_idx[1] : start_idx[1] + subslice_expanded.shape[2],
+            ] = subslice_expanded
+            del frames
+
+        self.n_read += n_frames
+        return times, values
+
+
+class FDSRun(simvue_fds.connector.FDSRun):
+    """An FDSRun which only reads new frames of each slice when parsing slices
+
+    The slices to track are found once, and on each later pass only frames
+    appended to the slice files since the previous pass are read, rather than
+    loading the simulation and every slice file from the start again. New frames
+    are read in chunks of at most FRAMES_PER_READ, and the min, max and average
+    of each chunk are calculated together.
+    """
+
+    _slice_streams = None
+
+    def launch(self, *args, **kwargs):
+        self._slice_streams = None
+        return super().launch(*args, **kwargs)
+
+    def load(self, *args, **kwargs):
+        self._slice_streams = None
+        return super().load(*args, **kwargs)
+
+    def _find_slices(self):
+        try:
+            sim = fdsreader.Simulation(str(self.workdir_path.absolute()))
+        except OSError as e:
+            if "no simulations were found in the directory" in str(e).lower():
+                logger.warning(
+                    f"Unable to load slice data found in output directory '{self.workdir_path}' - "
+                    f"no simulation data found. Retrying in {self.slice_parse_interval}s..."
+                )
+                return []
+            logger.warning(
+                f"Unable to load slice data found in output directory '{self.workdir_path}'. "
+                f"Slice parsing is disabled for this run. This is because: {e}"
+            )
+            return None
+
+        slices = (
+            [sim.slices.get_by_id(_id) for _id in self.slice_parse_ids]
+            if self.slice_parse_ids
+            else sim.slices
+        )
+        # Get rid of any Nones - caused by slice IDs not found in results
+        slices = [slice for slice in slices if slice is not None and slice.type == "2D"]
+
+        if self.slice_parse_quantities:
+            slices = [
+                slice
+                for slice in slices
+                if slice.quantity.quantity in self.slice_parse_quantities
+            ]
+
+        if self.slice_parse_fixed_dimensions:
+            slices = [
+                slice
+                for slice in slices
+                if any(
+                    dim not in slice.extent_dirs
+                    for dim in self.slice_parse_fixed_dimensions
+                )
+            ]
+
+        streams = []
+        for slice in slices:
+            # Due to edge cases which may break fdsreader, we cover this in a try... except
+            try:
+                streams.append(SliceStream(slice, str(self.workdir_path.absolute())))
+            except Exception as e:
+                logger.warning(
+                    "Unable to parse a slice due to unexpected values within the slice - "
+                    "enable debug logging for full traceback."
+                )
+                logger.debug(e)
+        return streams
+
+    def _define_slice_grid(self, stream):
+        metric_name = stream.metric_name
+        extent_dirs = stream.slice.extent_dirs
+
+        # Check size doesn't breach server limit
+        if stream.shape[0] * stream.shape[1] > simvue_fds.connector.MAXIMUM_SLICE_SIZE:
+            logger.warning(
+                f"Slice '{metric_name}' exceeds the maximum size for upload to the server - ignoring this metric."
+            )
+            self._grids_too_large.append(metric_name)
+            return False
+
+        self.assign_metric_to_grid(
+            metric_name=metric_name,
+            axes_ticks=[
+                stream.coords[extent_dirs[0]].tolist(),
+                stream.coords[extent_dirs[1]].tolist(),
+            ],
+            axes_labels=extent_dirs,
+        )
+        self._grids_defined.append(metric_name)
+        self._slice_masks[metric_name] = create_obst_mask(
+            self.fds_input_file_path, stream.slice
+        )
+
+        if not self._supports_obst_nans():
+            logger.warning(
+                "Your Simvue server is running a noSim version lower than 1.6.8, which is required "
+                "to support OBSTs within 3D metrics. Falling back to uploading OBSTs as zeros..."
+            )
+
+        # Record the colorbar this slice should use:
+        self.update_metadata(
+            {
+                "simvue": {
+                    "plots": {
+                        metric_name: {
+                            "colourscale": (
+                                "Rainbow (inverse)"
+                                if "visibility"
+                                in stream.slice.quantity.quantity.lower()
+                                else "Rainbow"
+                            )
+                        }
+                    }
+                }
+            }
+        )
+        return True
+
+    def _supports_obst_nans(self):
+        return self.mode != "online" or (
+            self._user_config.nosim_version
+            and self._user_config.nosim_version >= semver.Version.parse("1.6.8")
+        )
+
+    def _parse_slice(self):
+        """Log metrics from the frames of each slice written since the last pass
+
+        Returns
+        -------
+        bool
+            Whether slice parsing should continue
+        """
+        if not self._slice_streams:
+            if (streams := self._find_slices()) is None:
+                return False
+            self._slice_streams = streams
+
+        parse_time = datetime.now(timezone.utc).timestamp()
+
+        for stream in self._slice_streams:
+            metric_name = stream.metric_name
+            if metric_name in self._grids_too_large:
+                continue
+
+            try:
+                n_new = stream.n_available()
+            except Exception as e:
+                logger.warning(
+                    f"Unable to read new data for slice '{metric_name}' - enable debug logging for full traceback."
+                )
+                logger.debug(e)
+                continue
+
+            if n_new <= 0:
+                continue
+
+            if metric_name not in self._grids_defined and not self._define_slice_grid(
+                stream
+            ):
+                continue
+
+            # Estimate the timestamp of each frame, spreading them evenly between passes
+            timestamps = self._last_parse_time + (
+                parse_time - self._last_parse_time
+            ) * (numpy.arange(1, n_new + 1) / n_new)
+            first_step = stream.n_read
+
+            # Only the frames available at the start of the pass are read, in chunks
+            while (n_read := stream.n_read - first_step) < n_new:
+                try:
+                    times, values = stream.read(min(FRAMES_PER_READ, n_new - n_read))
+                except Exception as e:
+                    logger.warning(
+                        f"Unable to read new data for slice '{metric_name}' - enable debug logging for full traceback."
+                    )
+                    logger.debug(e)
+                    break
+
+                if not times.size:
+                    break
+
+                self._log_slice_frames(
+                    metric_name, times, values, first_step + n_read, timestamps[n_read:]
+                )
+
+        self._last_parse_time = parse_time
+        return True
+
+    def _log_slice_frames(self, metric_name, times, values, first_step, timestamps):
+        # Apply NaN mask for OBSTs
+        if self._supports_obst_nans():
+            values[:, self._slice_masks[metric_name]] = numpy.nan
+
+        # Reduce all frames at once, ignoring OBSTs
+        minimums = numpy.nanmin(values, axis=(1, 2))
+        maximums = numpy.nanmax(values, axis=(1, 2))
+        averages = numpy.nanmean(values, axis=(1, 2))
+
+        for time_idx, time_val in enumerate(times):
+            self.log_metrics(
+                {
+                    metric_name: values[time_idx].T,
+                    f"{metric_name}.min": minimums[time_idx],
+                    f"{metric_name}.max": maximums[time_idx],
+                    f"{metric_name}.avg": averages[time_idx],
+                },
+                time=time_val,
+                step=first_step + time_idx,
+                timestamp=datetime.fromtimestamp(timestamps[time_idx], tz=timezone.utc),
+            )
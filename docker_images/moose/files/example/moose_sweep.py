@@ -0,0 +1,147 @@
+import argparse
+import concurrent.futures
+import os
+import re
+import shutil
+import threading
+import time
+import multiparser
+import multiparser.parsing.tail as mp_tail_parser
+import simvue
+
+script_dir = os.path.dirname(__file__)
+
+parser = argparse.ArgumentParser(
+    description="Run a sweep of MOOSE simulations in parallel, tracking each with Simvue."
+)
+parser.add_argument(
+    "--max-parallel",
+    type=int,
+    default=os.cpu_count(),
+    help="The maximum number of simulations to run at once.",
+)
+parser.add_argument(
+    "--moose-app",
+    type=str,
+    default="/home/dev/simvue-moose/app/moose_tutorial-opt",
+    help="Path to the MOOSE application.",
+)
+args = parser.parse_args()
+
+# Delete any results from previous runs
+if os.path.exists(os.path.join(script_dir, "results")):
+    shutil.rmtree(os.path.join(script_dir, "results"))
+
+# Each case in the sweep has its own MOOSE input, results directory and Simvue run,
+# more cases can be added here, eg varying other parameters of the input file
+cases = [
+    {
+        "material": material,
+        "run_name": f"mug_thermal_{material}-{time.time():.0f}",
+        "moose_file": os.path.join(script_dir, f"{material}_mug.i"),
+        "results_dir": os.path.join(script_dir, "results", material),
+    }
+    for material in ("steel", "ceramic", "copper")
+]
+
+# Runs for cases which are currently being simulated, keyed by results directory,
+# so that data from any file can be passed on to the run it belongs to
+active_runs = {}
+active_runs_lock = threading.Lock()
+
+# Set once every case has finished, to stop the file monitor
+sweep_complete = threading.Event()
+
+
+def run_for_file(file_name):
+    with active_runs_lock:
+        return active_runs.get(os.path.dirname(os.path.abspath(file_name)))
+
+
+def per_metric(csv_data, sim_metadata):
+    if not (run := run_for_file(sim_metadata["file_name"])):
+        return
+    metric_time = csv_data.pop("time", None)
+    run.log_metrics(csv_data, time=metric_time)
+
+
+def per_event(log_data, sim_metadata):
+    if not (run := run_for_file(sim_metadata["file_name"])):
+        return
+    run.log_event(list(log_data.values())[0])
+
+
+def run_case(case):
+    finished = threading.Event()
+    results_dir = os.path.abspath(case["results_dir"])
+
+    # Abort only this case if an alert fires, rather than the whole sweep
+    with simvue.Run(abort_callback=lambda _: finished.set()) as run:
+        run.config(abort_on_alert="run")
+        run.init(
+            name=case["run_name"],
+            description="A simulation to model the transfer of heat through a coffee cup filled with hot liquid.",
+            folder="/mug_thermal",
+            tags=[case["material"], "sweep"],
+            metadata={"material": case["material"]},
+        )
+        run.create_metric_threshold_alert(
+            name="handle_too_hot",
+            metric="handle_temp_avg",
+            rule="is above",
+            threshold=323.15,
+            frequency=1,
+            window=1,
+            trigger_abort=True,
+        )
+
+        with active_runs_lock:
+            active_runs[results_dir] = run
+
+        # Override the output location so that every case writes to its own directory
+        run.add_process(
+            f"moose_{case['material']}",
+            f"Outputs/file_base={os.path.join(results_dir, 'mug_thermal')}",
+            executable=args.moose_app,
+            i=case["moose_file"],
+            color="off",
+            completion_trigger=finished,
+        )
+        finished.wait()
+
+        with active_runs_lock:
+            active_runs.pop(results_dir)
+
+        for file_name in ("mug_thermal.e", "mug_thermal.csv"):
+            if os.path.exists(os.path.join(results_dir, file_name)):
+                run.save_file(os.path.join(results_dir, file_name), "output")
+
+    print(f"Simulation of mug made from {case['material']} complete")
+
+
+# A single file monitor watches the results of every case in the sweep, rather than
+# starting a separate monitor with its own threads for each simulation
+with multiparser.FileMonitor(termination_trigger=sweep_complete) as file_monitor:
+    file_monitor.tail(
+        path_glob_exprs=os.path.join(script_dir, "results", "*", "mug_thermal.csv"),
+        parser_func=mp_tail_parser.record_csv,
+        callback=per_metric,
+    )
+    file_monitor.tail(
+        path_glob_exprs=os.path.join(script_dir, "results", "*", "mug_thermal.txt"),
+        callback=per_event,
+        tracked_values=[
+            re.compile(r"Time Step.*"),
+            " Solve Did NOT Converge!",
+        ],
+        labels=["time_step", "non_converged"],
+    )
+    file_monitor.run()
+
+    # Cases wait for a free slot in the pool, limiting how many simulations run at once
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.max_parallel) as pool:
+        list(pool.map(run_case, cases))
+
+    sweep_complete.set()
+
+print("All simulations complete!")
@@ -1,4 +1,5 @@
 import simvue
+import csv
 import multiparser
 import multiparser.parsing.file as mp_file_parser
 import time
@@ -31,6 +32,18 @@ def moose_header_parser(input_file, **_):
     return {}, header_data
 
 
+@mp_file_parser.file_parser
+def moose_temperature_parser(input_file, **_):
+    # Read every row of the CSV at once, so that all temperatures at a given
+    # step can be logged together in a single call to log_metrics
+    with open(input_file) as file:
+        temperatures = {
+            f"temp_at_x.{row['x']}": float(row["T"]) for row in csv.DictReader(file)
+        }
+
+    return {}, temperatures
+
+
 run_name = "thermal-diffusion-monitoring-%d" % time.time()
 
 with simvue.Run() as run:
@@ -75,10 +88,10 @@ with simvue.Run() as run:
             )
             trigger.set()
 
-    def per_metric(csv_data, sim_metadata):
+    def per_metric(temperatures, sim_metadata):
         step_num = sim_metadata["file_name"].split("_")[-1].split(".")[0]
         run.log_metrics(
-            {f"temp_at_x.{csv_data['x']}": csv_data["T"]},
+            temperatures,
             step=int(step_num),
             timestamp=sim_metadata["timestamp"],
         )
@@ -110,7 +123,7 @@ with simvue.Run() as run:
                 script_dir, "results", "simvue_thermal_temps_*.csv"
             ),
             callback=per_metric,
+            parser_func=moose_temperature_parser,
             static=True,
         )
         file_monitor.run()
-
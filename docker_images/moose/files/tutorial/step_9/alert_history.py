@@ -0,0 +1,115 @@
+import csv
+import os
+import time
+import numpy
+
+# Parquet is used for columnar output if available, otherwise numpy arrays
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class AlertHistory:
+    """Record the status of the alerts of a run over time
+
+    Rows are written to '<path>.csv' through a single buffered file, which is
+    flushed at most every 'flush_interval' seconds rather than after every row.
+    Columns are created for alerts as they are first seen, so the names of the
+    alerts do not need to be known in advance.
+
+    If 'columnar' is set, rows are also collected into chunks which are written
+    to the directory '<path>/', as Parquet files if pyarrow is installed or as
+    numpy .npz files otherwise, with a time column and a boolean column per
+    alert which is True while the alert is firing.
+    """
+
+    def __init__(self, path, columnar=False, flush_interval=10.0, chunk_rows=1000):
+        self._path = path
+        self._flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._alert_names = []
+
+        self._csv_file = open(f"{path}.csv", "w", newline="", buffering=65536)
+        self._csv_writer = csv.writer(self._csv_file)
+        self._csv_writer.writerow(["time"])
+
+        self._chunk_dir = path if columnar else None
+        self._chunk_rows = chunk_rows
+        self._n_chunks = 0
+        self._times = []
+        self._firing = []
+        if columnar:
+            os.makedirs(path, exist_ok=True)
+
+    def record(self, time_elapsed, alert_states):
+        """Add a row from a dictionary of {alert name: whether it is firing}"""
+        if new_names := [
+            name for name in alert_states if name not in self._alert_names
+        ]:
+            self._add_columns(new_names)
+
+        firing = [alert_states.get(name, False) for name in self._alert_names]
+        self._csv_writer.writerow(
+            [time_elapsed, *("Firing" if state else "Normal" for state in firing)]
+        )
+
+        if self._chunk_dir:
+            self._times.append(time_elapsed)
+            self._firing.append(firing)
+            if len(self._times) >= self._chunk_rows:
+                self._write_chunk()
+
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        """Write buffered rows to disk if the flush interval has passed"""
+        if time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered rows to disk"""
+        self._csv_file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Write any remaining rows and close the CSV file"""
+        if self._times:
+            self._write_chunk()
+        self._csv_file.close()
+
+    def _add_columns(self, new_names):
+        # An alert added part way through the run needs a new column, so the CSV is
+        # rewritten with the column empty for earlier rows. This is rare, since most
+        # alerts are created when the run is initialised.
+        self._csv_file.close()
+        with open(f"{self._path}.csv", newline="") as csv_file:
+            rows = list(csv.reader(csv_file))
+
+        self._csv_file = open(f"{self._path}.csv", "w", newline="", buffering=65536)
+        self._csv_writer = csv.writer(self._csv_file)
+        self._csv_writer.writerow([*rows[0], *new_names])
+        self._csv_writer.writerows(rows[1:])
+
+        # Chunks already written keep their own columns
+        if self._times:
+            self._write_chunk()
+        self._alert_names.extend(new_names)
+
+    def _write_chunk(self):
+        firing = numpy.array(self._firing, dtype=bool).reshape(
+            len(self._times), len(self._alert_names)
+        )
+        columns = {"time": numpy.array(self._times, dtype=float)}
+        columns |= {name: firing[:, i] for i, name in enumerate(self._alert_names)}
+
+        chunk_path = os.path.join(self._chunk_dir, f"part-{self._n_chunks:05d}")
+        if pyarrow:
+            pyarrow.parquet.write_table(pyarrow.table(columns), f"{chunk_path}.parquet")
+        else:
+            numpy.savez_compressed(f"{chunk_path}.npz", **columns)
+
+        self._n_chunks += 1
+        self._times.clear()
+        self._firing.clear()
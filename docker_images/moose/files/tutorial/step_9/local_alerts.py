@@ -0,0 +1,148 @@
+# The same ThresholdRule and LocalAlertsMixin are used by
+# docker_images/fds/files/local_alerts.py, since each Docker image is built from its own
+# directory. Any change to them must be made in both files, which should only differ in
+# the Run class defined at the end.
+import collections
+import numbers
+import threading
+import time
+import simvue
+
+
+class ThresholdRule:
+    """Evaluate a metric threshold alert locally as values are logged
+
+    Follows the same rules as the server: values logged within the last
+    'window' seconds are aggregated and compared with the threshold, at most
+    once every 'frequency' seconds.
+    """
+
+    def __init__(self, name, threshold, rule, window, frequency, aggregation):
+        self.name = name
+        self._threshold = threshold
+        self._above = rule == "is above"
+        self._window = window
+        self._frequency = frequency
+        self._aggregation = aggregation
+        self._values = collections.deque()
+        self._last_evaluated = None
+
+    def _exceeds(self, value):
+        return value > self._threshold if self._above else value < self._threshold
+
+    def add(self, value, log_time):
+        """Add a value, returning whether the alert is now firing"""
+        self._values.append((log_time, value))
+        while self._values[0][0] <= log_time - self._window:
+            self._values.popleft()
+
+        if (
+            self._last_evaluated is not None
+            and log_time - self._last_evaluated < self._frequency
+        ):
+            return False
+        self._last_evaluated = log_time
+
+        values = [value for _, value in self._values]
+        if self._aggregation == "average":
+            return self._exceeds(sum(values) / len(values))
+        if self._aggregation == "sum":
+            return self._exceeds(sum(values))
+        if self._aggregation == "at least one":
+            return any(self._exceeds(value) for value in values)
+        return all(self._exceeds(value) for value in values)
+
+
+class LocalAlertsMixin:
+    """Stop the simulation as soon as an aborting threshold alert is breached
+
+    Metric threshold alerts created with 'trigger_abort=True' are also
+    evaluated in this process whenever their metric is logged. If one fires,
+    the simulation is stopped straight away as it would be by an abort from
+    the server, usually by killing the processes of the run, rather than
+    waiting for the metrics to be sent, evaluated by the server and the abort
+    to be picked up by the next heartbeat. The alert is still created on the server as
+    normal, which remains responsible for its status and for aborting the run.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._local_alerts = collections.defaultdict(list)
+        self._local_alerts_lock = threading.Lock()
+        self._local_abort_sent = False
+        super().__init__(*args, **kwargs)
+
+    def create_metric_threshold_alert(
+        self,
+        name,
+        metric,
+        threshold,
+        rule,
+        *,
+        window=None,
+        frequency=1,
+        aggregation="average",
+        trigger_abort=False,
+        **kwargs,
+    ):
+        if trigger_abort:
+            with self._local_alerts_lock:
+                self._local_alerts[metric].append(
+                    ThresholdRule(
+                        name,
+                        threshold,
+                        rule,
+                        window or frequency,
+                        frequency,
+                        aggregation,
+                    )
+                )
+
+        return super().create_metric_threshold_alert(
+            name=name,
+            metric=metric,
+            threshold=threshold,
+            rule=rule,
+            window=window,
+            frequency=frequency,
+            aggregation=aggregation,
+            trigger_abort=trigger_abort,
+            **kwargs,
+        )
+
+    def log_metrics(self, metrics, *args, **kwargs):
+        result = super().log_metrics(metrics, *args, **kwargs)
+
+        log_time = time.monotonic()
+        with self._local_alerts_lock:
+            if self._local_abort_sent:
+                return result
+            fired = [
+                alert.name
+                for metric, value in metrics.items()
+                if isinstance(value, numbers.Real)
+                for alert in self._local_alerts.get(metric, ())
+                if alert.add(float(value), log_time)
+            ]
+            self._local_abort_sent = bool(fired)
+
+        if fired:
+            self._local_abort(fired)
+
+        return result
+
+    def _local_abort(self, alert_names):
+        self.log_event(
+            f"Alert(s) {', '.join(alert_names)} breached locally, stopping the simulation"
+        )
+        self._alert_raised_trigger.set()
+
+        # Stop the simulation in the same way as an abort from the server, so that
+        # connectors which stop their simulation gracefully can still do so
+        if self._abort_callback:
+            self._abort_callback(self)
+        if self._abort_on_alert != "ignore":
+            self.kill_all_processes()
+
+
+class Run(LocalAlertsMixin, simvue.Run):
+    """A Simvue Run which evaluates aborting threshold alerts locally"""
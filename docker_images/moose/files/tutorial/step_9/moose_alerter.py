@@ -1,49 +1,197 @@
 import simvue
 import argparse
-import csv
 import time
 import os
+from alert_history import AlertHistory
 
-parser = argparse.ArgumentParser(description='Monitor alerts from a Simvue run.')
+parser = argparse.ArgumentParser(description='Monitor alerts from one or more Simvue runs.')
 parser.add_argument(
-  '--run-name', 
+  '--run-name',
   type=str,
   help='The name of the run to monitor alerts for.'
   )
 parser.add_argument(
-  '--time-interval', 
+  '--folder',
+  type=str,
+  help='Monitor alerts for every active run in this folder, eg /moose.'
+  )
+parser.add_argument(
+  '--tag',
+  type=str,
+  help='Monitor alerts for every active run with this tag.'
+  )
+parser.add_argument(
+  '--time-interval',
   type=int,
-  help='The interval between queries to the alert status, in seconds.'
+  help='The longest interval between queries to the alert status, in seconds.'
   )
 parser.add_argument(
-  '--max-time', 
+  '--min-interval',
+  type=float,
+  default=1,
+  help='The shortest interval between queries to the alert status, in seconds, used after a change.'
+  )
+parser.add_argument(
+  '--max-time',
   type=int,
   help='The maximum time which this script will run for.'
   )
+parser.add_argument(
+  '--changes-only',
+  action='store_true',
+  help='Only write a row when the status of an alert changes.'
+  )
+parser.add_argument(
+  '--columnar',
+  action='store_true',
+  help='Also write the alert history in columnar chunks, as Parquet if pyarrow is installed or .npz otherwise.'
+  )
+parser.add_argument(
+  '--flush-interval',
+  type=float,
+  default=10,
+  help='The longest time which rows are held in memory before being written to disk, in seconds.'
+  )
+parser.add_argument(
+  '--server-url',
+  type=str,
+  default=None,
+  help='Query this server instead of the one in the Simvue configuration, eg a local test server.'
+  )
+parser.add_argument(
+  '--server-token',
+  type=str,
+  default=None,
+  help='Token for the server given by --server-url.'
+  )
 args = parser.parse_args()
 
 script_dir = os.path.dirname(__file__)
 
-with open(os.path.join(script_dir, 'results', 'alert_status.csv'), 'w', newline='') as csvfile: 
-    csvwriter = csv.writer(csvfile) 
-    csvwriter.writerow(['time', 'step_not_converged', 'temperature_exceeds_maximum', 'temperature_exceeds_melting_point'])
-
-time_elapsed = 0
-client = simvue.Client()
-run_id = client.get_run_id_from_name(args.run_name)
-
-while time_elapsed < args.max_time:
-    alerts = client.get_alerts(run_id)
-    with open(os.path.join(script_dir, 'results', 'alert_status.csv'), 'a', newline='') as csvfile: 
-        csvwriter = csv.writer(csvfile) 
-        csvwriter.writerow(
-            [
-                time_elapsed, 
-                ('Firing' if 'step_not_converged' in alerts else 'Normal'), 
-                ('Firing' if 'temperature_exceeds_maximum' in alerts else 'Normal'),
-                ('Firing' if 'temperature_exceeds_melting_point' in alerts else 'Normal')
-            ]
-          )
-    
-    time.sleep(args.time_interval)
-    time_elapsed += args.time_interval
\ No newline at end of file
+finished_statuses = ('completed', 'failed', 'terminated', 'lost')
+
+# All runs matching these filters are retrieved together in each query
+filters = []
+if args.run_name:
+    filters.append(f'name == {args.run_name}')
+if args.folder:
+    filters.append(f'folder.path == {args.folder}')
+if args.tag:
+    filters.append(f'has tag.{args.tag}')
+if not filters:
+    parser.error('at least one of --run-name, --folder or --tag is required')
+
+
+def get_runs(client, filters, page_size=100):
+    # Retrieve the status and alert names of every matching run, with one request
+    # per page of runs rather than a separate request for each run. Runs are keyed
+    # by ID, since several runs may have the same name.
+    runs = {}
+    start_index = 0
+    while True:
+        n_runs = 0
+        for run_id, run in client.get_runs(
+            filters, alerts=True, count_limit=page_size, start_index=start_index
+        ):
+            n_runs += 1
+            runs[run_id] = (
+                run.name,
+                run.status,
+                [alert['name'] for alert in run.get_alert_details()],
+            )
+        start_index += n_runs
+        if n_runs < page_size:
+            return runs
+
+
+def get_alert_states(client, run_id, alert_names):
+    # Whether each alert of the run is firing, only queried for runs being monitored
+    if not alert_names:
+        return {}
+    critical = set(client.get_alerts(run_id=run_id, critical_only=True))
+    return {name: name in critical for name in alert_names}
+
+
+def status_path(run_name, run_id):
+    # Keep the original file name when monitoring a single named run, unless an
+    # earlier run with the same name is already using it
+    path = os.path.join(script_dir, 'results', 'alert_status')
+    if args.run_name and not (args.folder or args.tag) and path not in status_paths:
+        return path
+    return os.path.join(script_dir, 'results', f'alert_status_{run_name}_{run_id}')
+
+
+# Client.get_alerts() reads the server for each run from the Simvue configuration
+# rather than from the client, so a server given here is passed on through it
+if args.server_url:
+    os.environ['SIMVUE_URL'] = args.server_url
+if args.server_token:
+    os.environ['SIMVUE_TOKEN'] = args.server_token
+
+client = simvue.Client(server_url=args.server_url, server_token=args.server_token)
+interval = args.min_interval
+previous_status = {}
+histories = {}
+status_paths = set()
+ignored_runs = set()
+start_time = time.monotonic()
+
+try:
+    while (time_elapsed := time.monotonic() - start_time) < args.max_time:
+        any_changed = False
+        all_running = True
+
+        runs = get_runs(client, filters)
+
+        for run_id, (run_name, run_status, alert_names) in runs.items():
+            # Runs which had already finished when first seen are not being monitored
+            if run_id in ignored_runs or (
+                run_id not in previous_status and run_status in finished_statuses
+            ):
+                ignored_runs.add(run_id)
+                continue
+
+            alert_status = get_alert_states(client, run_id, alert_names)
+            changed = alert_status != previous_status.get(run_id)
+
+            if run_id not in histories:
+                path = status_path(run_name, run_id)
+                status_paths.add(path)
+                histories[run_id] = AlertHistory(
+                    path,
+                    columnar=args.columnar,
+                    flush_interval=args.flush_interval,
+                )
+
+            if changed or not args.changes_only:
+                histories[run_id].record(round(time_elapsed, 1), alert_status)
+
+            # Stop monitoring runs once they have finished, since nothing more will change
+            if run_status in finished_statuses:
+                ignored_runs.add(run_id)
+                histories.pop(run_id).close()
+
+            previous_status[run_id] = alert_status
+            any_changed |= changed
+            all_running &= run_status == 'running'
+
+        # Rows are only recorded on changes with --changes-only, so buffered rows
+        # are also written out here once the flush interval has passed
+        for history in histories.values():
+            history.flush_if_due()
+
+        # Runs with a given name will not start again once they have all finished
+        if args.run_name and runs and ignored_runs.issuperset(runs):
+            break
+
+        # Poll quickly while any run is starting or just after a change, backing off
+        # towards the longest interval while nothing changes
+        if any_changed or not all_running:
+            interval = args.min_interval
+        else:
+            interval = min(2 * interval, args.time_interval)
+
+        time.sleep(interval)
+finally:
+    for history in histories.values():
+        history.close()
@@ -0,0 +1,62 @@
+import collections
+import threading
+
+
+class EventAggregator:
+    """Coalesce frequent solver events into a single event per time window
+
+    Lines added within the window are held and then logged together as one
+    event giving the number of lines with each label, the timestamps of the
+    first and last line and the most recent line. Anomalous lines are logged
+    straight away with 'log_now', after any held lines so ordering is kept.
+    """
+
+    def __init__(self, log_event, window=10.0):
+        self._log_event = log_event
+        self._window = window
+        self._lock = threading.Lock()
+        self._timer = None
+        self._counts = collections.Counter()
+        self._first_timestamp = None
+        self._last_timestamp = None
+        self._last_line = None
+
+    def add(self, label, line, timestamp):
+        """Hold a line, to be logged when the current window ends"""
+        with self._lock:
+            if not self._counts:
+                self._first_timestamp = timestamp
+                self._timer = threading.Timer(self._window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            self._counts[label] += 1
+            self._last_timestamp = timestamp
+            self._last_line = line
+
+    def log_now(self, line):
+        """Log any held lines followed immediately by the given line"""
+        with self._lock:
+            self._flush()
+            self._log_event(line)
+
+    def flush(self):
+        """Log any held lines as a single event"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._counts:
+            return
+
+        counts = ", ".join(
+            f"{count} x {label}" for label, count in self._counts.items()
+        )
+        self._log_event(
+            f"{self._counts.total()} solver events from {self._first_timestamp} to "
+            f"{self._last_timestamp} ({counts}), latest: {self._last_line.strip()}"
+        )
+        self._counts.clear()
@@ -1,12 +1,17 @@
-import simvue
 import multiparser
-import multiparser.parsing.file as mp_file_parser
-import multiparser.parsing.tail as mp_tail_parser
 import time
+import functools
 import shutil
 import os
-import re
 import multiprocessing
+from local_alerts import Run
+from moose_events import EventAggregator
+from moose_parsers import (
+    moose_header_parser,
+    moose_log_parser,
+    moose_vector_parser,
+    temperature_metrics,
+)
 
 script_dir = os.path.dirname(__file__)
 
@@ -16,25 +21,11 @@ if os.path.exists(os.path.join(script_dir, "results")):
 trigger = multiprocessing.Event()
 
 
-@mp_file_parser.file_parser
-def moose_header_parser(input_file, **_):
-    with open(input_file) as file:
-        file_lines = file.readlines()
-    file_lines = list(filter(None, file_lines))
-    header_lines = file_lines[1:7]
-    header_data = {}
-    for line in header_lines:
-        key, value = line.split(":", 1)
-        key = key.replace(" ", "_").lower()
-        value = value.strip()
-        header_data[key] = value
-
-    return {}, header_data
-
-
 run_name = "thermal-diffusion-monitoring-%d" % time.time()
 
-with simvue.Run() as run:
+# Stop monitoring the files once the run is aborted, whether by an alert breached
+# locally or by the server
+with Run(abort_callback=lambda _: trigger.set()) as run:
     run.init(
         name=run_name,
         description="A simulation to model the diffusion of heat across a metal bar",
@@ -79,33 +70,43 @@ with simvue.Run() as run:
         trigger_abort=True,
     )
 
+    # Time step and convergence messages are logged as one event every 10s,
+    # any other events are logged immediately
+    events = EventAggregator(run.log_event, window=10)
+
+    def per_non_converged(line, _):
+        events.log_now(line)
+        run.kill_all_processes()
+        run.save_file(os.path.join(script_dir, "results", "simvue_thermal.e"), "output")
+        run.set_status("failed")
+        trigger.set()
+        print("Simulation Terminated due to Non Convergence!")
+
+    def per_finished(*_):
+        events.flush()
+        time.sleep(1)  # To allow other processes to complete
+        run.update_tags(
+            [
+                "completed",
+            ]
+        )
+        trigger.set()
+
+    event_handlers = {
+        "time_step": functools.partial(events.add, "time_step"),
+        "converged": functools.partial(events.add, "converged"),
+        "non_converged": per_non_converged,
+        "finished": per_finished,
+    }
+
     def per_event(log_data, metadata):
-        if any(
-            key in ("time_step", "converged", "non_converged")
-            for key in log_data.keys()
-        ):
-            run.log_event(list(log_data.values())[0])
-            if "non_converged" in log_data.keys():
-                run.kill_all_processes()
-                run.save_file(
-                    os.path.join(script_dir, "results", "simvue_thermal.e"), "output"
-                )
-                run.set_status("failed")
-                trigger.set()
-                print("Simulation Terminated due to Non Convergence!")
-        elif "finished" in log_data.keys():
-            time.sleep(1)  # To allow other processes to complete
-            run.update_tags(
-                [
-                    "completed",
-                ]
-            )
-            trigger.set()
+        for label, line in log_data.items():
+            event_handlers[label](line, metadata["timestamp"])
 
-    def per_metric(csv_data, sim_metadata):
+    def per_metric(vectors, sim_metadata):
         step_num = sim_metadata["file_name"].split("_")[-1].split(".")[0]
         run.log_metrics(
-            {f"temp_at_x.{csv_data['x']}": csv_data["T"]},
+            temperature_metrics(vectors),
             step=int(step_num),
             timestamp=sim_metadata["timestamp"],
         )
@@ -116,13 +117,7 @@ with simvue.Run() as run:
         file_monitor.tail(
             path_glob_exprs=os.path.join(script_dir, "results", "simvue_thermal.txt"),
             callback=per_event,
-            tracked_values=[
-                re.compile(r"Time Step.*"),
-                " Solve Converged!",
-                " Solve Did NOT Converge!",
-                "Finished Executing",
-            ],
-            labels=["time_step", "converged", "non_converged", "finished"],
+            parser_func=moose_log_parser,
         )
         file_monitor.track(
             path_glob_exprs=os.path.join(script_dir, "results", "simvue_thermal.txt"),
@@ -137,7 +132,7 @@ with simvue.Run() as run:
                 script_dir, "results", "simvue_thermal_temps_*.csv"
             ),
             callback=per_metric,
+            parser_func=moose_vector_parser,
             static=True,
         )
         file_monitor.run()
-
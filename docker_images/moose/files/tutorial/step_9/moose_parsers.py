@@ -0,0 +1,119 @@
+import functools
+import os
+import re
+import multiparser.parsing.file as mp_file_parser
+import multiparser.parsing.tail as mp_tail_parser
+import numpy
+
+# The header follows the first line of the MOOSE console log
+HEADER_LINES = 6
+HEADER_READ_LIMIT = 8192
+
+# Parsed headers keyed by the device and inode of the log file
+_header_cache = {}
+
+# Every tracked line of the MOOSE console log, each named by its label
+MOOSE_LOG_RE = re.compile(
+    r"(?P<time_step>Time Step.*)"
+    r"|(?P<converged> Solve Converged!)"
+    r"|(?P<non_converged> Solve Did NOT Converge!)"
+    r"|(?P<finished>Finished Executing)"
+)
+
+
+@mp_tail_parser.log_parser
+def moose_log_parser(file_content, **_):
+    """Find the tracked lines in newly written content of the MOOSE console log
+
+    The content is scanned once with a single pattern, giving a dictionary
+    of {label: line} for each match in the order in which they were written.
+    """
+    matches = [
+        {match.lastgroup: match.group()}
+        for match in MOOSE_LOG_RE.finditer(file_content)
+    ]
+
+    # An entry is always returned so that the position in the file is stored
+    return {}, matches or [{}]
+
+
+@mp_file_parser.file_parser
+def moose_header_parser(input_file, **_):
+    """Parse the header at the top of the MOOSE console log
+
+    At most the first few KB of the file are read, however large the log has
+    grown, and once a complete header has been read it is cached for the file
+    so it is never parsed again.
+    """
+    file_stat = os.stat(input_file)
+    cache_key = (file_stat.st_dev, file_stat.st_ino)
+
+    if (header_data := _header_cache.get(cache_key)) is not None:
+        return {}, header_data
+
+    header_data = {}
+    n_bytes_read = 0
+
+    with open(input_file) as file:
+        for line_number in range(HEADER_LINES + 1):
+            line = file.readline(HEADER_READ_LIMIT - n_bytes_read)
+            n_bytes_read += len(line)
+            if not line.endswith("\n"):
+                # The header has not been fully written yet
+                return {}, header_data
+            if not line_number:
+                continue
+            key, value = line.split(":", 1)
+            header_data[key.replace(" ", "_").lower()] = value.strip()
+
+    _header_cache[cache_key] = header_data
+    return {}, header_data
+
+
+@mp_file_parser.file_parser
+def moose_vector_parser(input_file, **_):
+    """Read a VectorPostprocessor CSV file into one array per column
+
+    The whole file is read in a single call, so the callback receives a
+    columnar block such as {"x": array([...]), "T": array([...])} once per
+    file rather than a dictionary per row.
+    """
+    with open(input_file) as file:
+        columns = file.readline().strip().split(",")
+        values = numpy.loadtxt(file, delimiter=",", ndmin=2)
+
+    if not values.size:
+        return {}, {}
+
+    return {}, dict(zip(columns, values.T))
+
+
+@functools.lru_cache(maxsize=8)
+def _temperature_metric_names(x_positions):
+    # The sampling points rarely change between steps, so the names only need
+    # to be formatted once rather than for every file
+    return tuple(
+        f"temp_at_x.{numpy.format_float_positional(x, trim='-')}"
+        for x in numpy.frombuffer(x_positions)
+    )
+
+
+def temperature_metrics(vectors):
+    """Create the metrics to log for a block of temperatures along the bar
+
+    Returns the temperature at each x position, named as 'temp_at_x.<x>',
+    along with the maximum and mean temperature and the steepest gradient.
+    """
+    x_positions, temperatures = vectors["x"], vectors["T"]
+
+    metrics = dict(
+        zip(_temperature_metric_names(x_positions.tobytes()), temperatures.tolist())
+    )
+    metrics["temperature.max"] = float(temperatures.max())
+    metrics["temperature.mean"] = float(temperatures.mean())
+
+    if len(temperatures) > 1:
+        gradient = numpy.gradient(temperatures, x_positions)
+        metrics["temperature.max_gradient"] = float(numpy.abs(gradient).max())
+
+    return metrics
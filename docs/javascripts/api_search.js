@@ -0,0 +1,137 @@
+// Search over the API reference using the prebuilt index written by
+// scripts/create_api_docs.py --search-index. The index is sharded by class,
+// shards are only fetched once a query needs them and are then kept for the
+// rest of the session.
+const apiSearch = {
+  index: null,
+  shards: new Map(),
+
+  root() {
+    const config = JSON.parse(document.getElementById("__config").textContent)
+    return new URL(`${config.base}/reference/`, location.href)
+  },
+
+  fetchJSON(url) {
+    return fetch(url).then(response => response.ok ? response.json() : null)
+  },
+
+  loadIndex() {
+    if (!this.index) {
+      this.index = this.fetchJSON(new URL("search/index.json", this.root()))
+        .catch(() => null)
+    }
+    return this.index
+  },
+
+  loadShard(shard) {
+    if (!this.shards.has(shard.shard)) {
+      this.shards.set(
+        shard.shard,
+        this.fetchJSON(new URL(`search/${shard.shard}`, this.root()))
+          .catch(() => null)
+      )
+    }
+    return this.shards.get(shard.shard)
+  },
+
+  // Members of a shard containing every query word, either exactly or as a
+  // prefix of an indexed term, with exact and name matches ranked first
+  match(shard, words) {
+    const scores = new Map()
+
+    for (const [i, word] of words.entries()) {
+      const found = new Map()
+      for (const [term, members] of Object.entries(shard.terms)) {
+        if (!term.startsWith(word)) continue
+        for (const member of members) {
+          found.set(member, Math.max(found.get(member) || 0, term === word ? 2 : 1))
+        }
+      }
+      for (const member of i ? scores.keys() : found.keys()) {
+        if (found.has(member)) {
+          scores.set(member, (scores.get(member) || 0) + found.get(member))
+        } else {
+          scores.delete(member)
+        }
+      }
+    }
+
+    return [...scores].map(([member, score]) => {
+      const [name, anchor, summary] = shard.entries[member]
+      return {
+        name, anchor, summary, label: shard.label, page: shard.page,
+        score: score + (name.toLowerCase().includes(words.join("_")) ? 4 : 0)
+      }
+    })
+  },
+
+  // Numbers of the shards containing a term starting with every query word,
+  // found from the term prefixes listed in the index
+  route(index, words) {
+    let needed = null
+    for (const word of words) {
+      const prefix = word.slice(0, index.prefix_length)
+      const found = new Set(
+        Object.entries(index.routes)
+          .filter(([key]) => key.startsWith(prefix))
+          .flatMap(([, shards]) => shards)
+      )
+      needed = needed ? new Set([...needed].filter(i => found.has(i))) : found
+    }
+    return [...needed]
+  },
+
+  async search(query) {
+    const words = query.toLowerCase().match(/[a-z0-9]+/g)
+    const index = await this.loadIndex()
+    if (!words || !index) return []
+
+    const shards = await Promise.all(
+      this.route(index, words).map(i => this.loadShard(index.shards[i]))
+    )
+    return shards
+      .filter(shard => shard)
+      .flatMap(shard => this.match(shard, words))
+      .sort((a, b) => b.score - a.score || a.name.localeCompare(b.name))
+      .slice(0, 20)
+  },
+
+  render(results, list) {
+    list.replaceChildren(...results.map(result => {
+      const item = document.createElement("li")
+      const link = document.createElement("a")
+      const page = result.page.replace(/\.md$/, "/")
+      link.href = new URL(`${page}#${result.anchor}`, this.root()).href
+      link.innerHTML = "<code></code> <small></small><br><span></span>"
+      link.querySelector("code").textContent = result.name
+      link.querySelector("small").textContent = result.label
+      link.querySelector("span").textContent = result.summary
+      item.append(link)
+      return item
+    }))
+  },
+
+  attach() {
+    const article = document.querySelector("article.md-content__inner")
+    if (!article || !location.pathname.includes("/reference/")) return
+
+    const form = document.createElement("div")
+    form.className = "api-search"
+    form.innerHTML = '<input type="search" placeholder="Search the API reference">'
+      + "<ul></ul>"
+    const input = form.querySelector("input")
+    const list = form.querySelector("ul")
+    let pending = 0
+
+    input.addEventListener("focus", () => this.loadIndex(), { once: true })
+    input.addEventListener("input", async () => {
+      const request = ++pending
+      const results = await this.search(input.value)
+      if (request === pending) this.render(results, list)
+    })
+
+    article.prepend(form)
+  }
+}
+
+document$.subscribe(() => apiSearch.attach())
@@ -0,0 +1,373 @@
+import pathlib
+import contextlib
+import inspect
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import typing
+import click
+
+import create_api_docs
+
+BASELINE_FILE = pathlib.Path(__file__).parent.joinpath(
+    "benchmarks", "api_docs_baseline.json"
+)
+BENCHMARK_MODULE = "_api_docs_benchmark"
+
+METHOD_TEMPLATE = '''
+    def method_{index}(self, name: str, count: int = {index}, scale: float = 1.0, labels: list[str] | None = None, *, verbose: bool = False) -> dict[str, float]:
+        """Perform synthetic operation number {index} on a Synthetic{cls} object.
+
+        This is a long description of the method used purely for benchmarking,
+        it spans several lines in the same way as the simvue docstrings do and
+        mentions that it Returns a value without starting a new section.
+
+        Parameters
+        ----------
+        name : str
+            name of the item to operate on, this description is long enough
+            to wrap onto a second line
+        count : int, optional
+            number of repetitions, by default {index}
+        scale : float, optional
+            scale factor applied to the result, by default 1.0
+        labels : list[str] | None, optional
+            labels to attach, one of:
+                * first - the first option
+                * second - the second option
+        verbose : bool, optional
+            whether to print additional output, by default False
+
+        Returns
+        -------
+        dict[str, float]
+            mapping of label to computed value
+
+        Raises
+        ------
+        ValueError
+            if the count is negative
+
+        Examples
+        --------
+        >>> obj = Synthetic{cls}()
+        >>> obj.method_{index}("item", count=2)
+        {{'item': 2.0}}
+        """
+        return {{}}
+'''
+
+PROPERTY_TEMPLATE = '''
+    @property
+    def property_{index}(self) -> int:
+        """Retrieve synthetic property number {index} of Synthetic{cls}.
+
+        Returns
+        -------
+        int
+            the property value
+        """
+        return {index}
+'''
+
+
+class StageResult(typing.TypedDict):
+    time: float
+    peak_memory: int
+
+
+def create_benchmark_module(
+    n_classes: int, n_methods: int, n_properties: int
+) -> list[dict[str, str]]:
+    """Create a module of synthetic classes to document
+
+    The module is registered in `sys.modules` so the classes can be resolved
+    from their dotted paths in the same way as the simvue classes.
+
+    Parameters
+    ----------
+    n_classes : int
+        number of classes to create
+    n_methods : int
+        number of methods for each class
+    n_properties : int
+        number of properties for each class
+
+    Returns
+    -------
+    list[dict[str, str]]
+        manifest targets for the created classes
+    """
+    class_bodies: list[str] = []
+
+    for i in range(n_classes):
+        body = "".join(METHOD_TEMPLATE.format(index=j, cls=i) for j in range(n_methods))
+        body += "".join(
+            PROPERTY_TEMPLATE.format(index=j, cls=i) for j in range(n_properties)
+        )
+        class_bodies.append(
+            f"class Synthetic{i}:\n"
+            f'    """Synthetic class {i} generated for benchmarking."""\n'
+            f"{body}"
+        )
+
+    module = types.ModuleType(BENCHMARK_MODULE)
+    exec(compile("\n".join(class_bodies), BENCHMARK_MODULE, "exec"), module.__dict__)
+    sys.modules[BENCHMARK_MODULE] = module
+
+    return [
+        {"label": f"Synthetic{i}", "target": f"{BENCHMARK_MODULE}.Synthetic{i}"}
+        for i in range(n_classes)
+    ]
+
+
+def measure(function: typing.Callable[[], None], repeat: int) -> StageResult:
+    """Measure the run time and peak memory allocated by a function
+
+    Timing and memory are measured in separate calls as tracing allocations
+    slows execution considerably.
+
+    Parameters
+    ----------
+    function : Callable[[], None]
+        function to benchmark
+    repeat : int
+        number of timed calls, the median is reported
+
+    Returns
+    -------
+    StageResult
+        median time in seconds and peak memory allocated in bytes
+    """
+    times: list[float] = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"time": statistics.median(times), "peak_memory": peak_memory}
+
+
+def run_benchmarks(
+    targets: list[dict[str, str]], repeat: int, jobs: int
+) -> dict[str, StageResult]:
+    """Benchmark each stage of the API documentation generator
+
+    Parameters
+    ----------
+    targets : list[dict[str, str]]
+        manifest targets to document
+    repeat : int
+        number of timed calls of each stage
+    jobs : int
+        number of processes used by the generator
+
+    Returns
+    -------
+    dict[str, StageResult]
+        results for each stage
+    """
+    members = [
+        (member, function)
+        for target in targets
+        for member, function in vars(
+            create_api_docs.resolve_target(target["target"])[0]
+        ).items()
+        if not member.startswith("_")
+    ]
+    entries = [
+        (
+            member,
+            (function.fget if isinstance(function, property) else function).__doc__,
+            inspect.signature(
+                function.fget if isinstance(function, property) else function
+            ),
+            isinstance(function, property),
+        )
+        for member, function in members
+    ]
+    template = create_api_docs.load_template()
+    results: dict[str, StageResult] = {}
+
+    def _parse() -> None:
+        for name, docstring, signature, _ in entries:
+            create_api_docs.parse_numpydoc(name, docstring, signature)
+
+    def _create_markdown() -> None:
+        for name, docstring, signature, is_property in entries:
+            create_api_docs.create_markdown(
+                name, docstring, signature, is_property, template=template
+            )
+
+    results["parse_numpydoc"] = measure(_parse, repeat)
+    results["create_markdown"] = measure(_create_markdown, repeat)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = pathlib.Path(temp_dir)
+        manifest_file = work_dir.joinpath("manifest.yml")
+        manifest_file.write_text(json.dumps({"targets": targets}))
+        mkdocs_file = work_dir.joinpath("mkdocs.yml")
+        mkdocs_file.write_text("nav:\n- Home: index.md\n")
+        cache_dir = work_dir.joinpath("cache")
+
+        def _generate(*extra_args: str) -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                create_api_docs.create_client_docs.main(
+                    [
+                        f"{work_dir}",
+                        f"{mkdocs_file}",
+                        "--manifest",
+                        f"{manifest_file}",
+                        "--cache-dir",
+                        f"{cache_dir}",
+                        "--jobs",
+                        f"{jobs}",
+                        *extra_args,
+                    ],
+                    standalone_mode=False,
+                )
+
+        def _cold() -> None:
+            _generate("--no-cache")
+
+        _generate()
+
+        results["create_client_docs (cold)"] = measure(_cold, repeat)
+        results["create_client_docs (cached)"] = measure(_generate, repeat)
+
+    return results
+
+
+@click.command
+@click.option("--classes", type=int, default=10, show_default=True)
+@click.option("--methods", type=int, default=200, show_default=True)
+@click.option("--properties", type=int, default=20, show_default=True)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help="Number of timed runs of each stage",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes used by the generator",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False),
+    default=f"{BASELINE_FILE}",
+    show_default=True,
+    help="File containing baseline results",
+)
+@click.option("--save-baseline", is_flag=True, help="Store results as the baseline")
+@click.option(
+    "--threshold",
+    type=float,
+    default=1.5,
+    show_default=True,
+    help="Ratio to the baseline above which a stage counts as a regression",
+)
+def benchmark_api_docs(
+    classes: int,
+    methods: int,
+    properties: int,
+    repeat: int,
+    jobs: int,
+    baseline: str,
+    save_baseline: bool,
+    threshold: float,
+) -> None:
+    """Benchmark the API documentation generator against synthetic classes
+
+    Parameters
+    ----------
+    classes : int
+        number of synthetic classes to document
+    methods : int
+        number of methods for each class
+    properties : int
+        number of properties for each class
+    repeat : int
+        number of timed runs of each stage
+    jobs : int
+        number of processes used by the generator
+    baseline : str
+        file containing baseline results
+    save_baseline : bool
+        store the results as the new baseline
+    threshold : float
+        ratio to the baseline time or memory above which a stage counts as a
+        regression, resulting in a non-zero exit code
+    """
+    targets = create_benchmark_module(classes, methods, properties)
+    print(
+        f"Benchmarking {classes} classes with {methods} methods "
+        f"and {properties} properties"
+    )
+    results = run_benchmarks(targets, repeat, jobs)
+
+    baseline_file = pathlib.Path(baseline)
+    config = {
+        "classes": classes,
+        "methods": methods,
+        "properties": properties,
+        "jobs": jobs,
+    }
+    baseline_results: dict[str, StageResult] = {}
+
+    if baseline_file.exists() and not save_baseline:
+        baseline_data = json.loads(baseline_file.read_text())
+        if baseline_data["config"] == config:
+            baseline_results = baseline_data["results"]
+        else:
+            print("Baseline was recorded with different options, not comparing")
+
+    regressions: list[str] = []
+
+    print(f"\n{'Stage':<30} {'Time [s]':>10} {'Peak [MiB]':>11} {'vs baseline':>12}")
+
+    for stage, result in results.items():
+        comparison: str = ""
+        if reference := baseline_results.get(stage):
+            time_ratio = result["time"] / reference["time"]
+            memory_ratio = result["peak_memory"] / reference["peak_memory"]
+            comparison = f"{time_ratio:.2f}x"
+            if time_ratio > threshold or memory_ratio > threshold:
+                regressions.append(stage)
+                comparison += " !"
+        print(
+            f"{stage:<30} {result['time']:>10.3f} "
+            f"{result['peak_memory'] / 2**20:>11.1f} {comparison:>12}"
+        )
+
+    if save_baseline:
+        baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        baseline_file.write_text(
+            json.dumps({"config": config, "results": results}, indent=2) + "\n"
+        )
+        print(f"\nBaseline written to '{baseline_file}'")
+
+    if regressions:
+        raise click.ClickException(
+            f"Regression above {threshold}x baseline in: {', '.join(regressions)}"
+        )
+
+
+if __name__ in "__main__":
+    benchmark_api_docs()
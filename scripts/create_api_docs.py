@@ -1,24 +1,264 @@
 import pathlib
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import importlib
+import importlib.metadata
+import json
+import os
+import queue
+import tempfile
 import jinja2
 import re
 import yaml
 import inspect
+import sys
+import time
+import typing
 import click
 
-# Import objects we want to document
-from simvue import Client, Run
-from simvue.api.objects import (
-    Run as RunObject,
-    Metrics,
-    Events,
-    Artifact,
-    FileArtifact,
-    ObjectArtifact,
-    Stats,
-    Storage,
-    S3Storage,
-    FileStorage,
-)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import watchdog.events
+    import watchdog.observers
+except ImportError:
+    watchdog = None
+
+TEMPLATE_FILE = pathlib.Path(__file__).parent.joinpath("code_entry_markdown.jinja")
+CACHE_DIR = pathlib.Path(__file__).parent.joinpath(".cache")
+MANIFEST_FILE = pathlib.Path(__file__).parent.joinpath("api_reference.yml")
+
+NUMPYDOC_SECTIONS: dict[str, str] = {
+    "Parameters": "parameters",
+    "Returns": "returns",
+    "Yields": "yields",
+    "Raises": "raises",
+    "Examples": "examples",
+}
+UNDERLINE_RE = re.compile(r"^\s*-{3,}\s*$")
+HEADING_UNDERLINE_RE = re.compile(r"={3,}")
+PARAMETER_RE = re.compile(r"^\s*[\w\d\_]+\s*:\s*.+")
+
+# Patterns used to normalise types when validating docstrings
+OPTIONAL_MARKER_RE = re.compile(r",\s*optional$")
+CLASS_REPR_RE = re.compile(r"<class '([^']+)'>")
+MODULE_PREFIX_RE = re.compile(r"\b(?:[A-Za-z_]\w*\.)+(?=[A-Za-z_])")
+GENERIC_TYPE_RE = re.compile(r"(\w+)\[(.*)\]")
+
+# Words indexed for the prebuilt API reference search
+SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Length of the term prefixes used to find the shards a query needs
+SEARCH_ROUTE_LENGTH = 2
+
+# Use the libyaml bindings where available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Object representations include memory addresses which change between runs
+MEMORY_ADDRESS_RE = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+class CachedEntry(typing.TypedDict):
+    metadata: "ParsedDocstring | dict"
+    markdown: str
+
+
+class EntryCache:
+    """Persistent on-disk cache of parsed and rendered reference entries
+
+    Entries are keyed by a hash of everything which determines their
+    rendered output, so a changed docstring, signature or template simply
+    results in a new key. Keys not used during a run are pruned on save.
+    """
+
+    def __init__(self, cache_dir: pathlib.Path | None) -> None:
+        """Load any existing cache from the given directory
+
+        Parameters
+        ----------
+        cache_dir : pathlib.Path | None
+            directory in which to store the cache, if None caching is disabled
+        """
+        self._cache_file = cache_dir.joinpath("entries.json") if cache_dir else None
+        self._entries: dict[str, CachedEntry] = {}
+        self._used: set[str] = set()
+
+        if self._cache_file and self._cache_file.exists():
+            try:
+                self._entries = json.loads(self._cache_file.read_text())
+            except json.JSONDecodeError:
+                self._entries = {}
+
+    def get(self, key: str) -> CachedEntry | None:
+        """Retrieve an entry from the cache
+
+        Parameters
+        ----------
+        key : str
+            content hash for the entry
+
+        Returns
+        -------
+        CachedEntry | None
+            parsed docstring and rendered markdown if present
+        """
+        self._used.add(key)
+        return self._entries.get(key)
+
+    def set(self, key: str, value: CachedEntry) -> None:
+        """Store an entry in the cache
+
+        Parameters
+        ----------
+        key : str
+            content hash for the entry
+        value : CachedEntry
+            parsed docstring and rendered markdown
+        """
+        self._used.add(key)
+        self._entries[key] = value
+
+    def save(self) -> None:
+        """Write the cache to disk, discarding entries unused in this run"""
+        if not self._cache_file:
+            return
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self._cache_file.write_text(
+            json.dumps({k: v for k, v in self._entries.items() if k in self._used})
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def generator_digest() -> bytes:
+    """Hash of the template and this script, shared by all cache keys
+
+    Returns
+    -------
+    bytes
+        digest of the generator inputs
+    """
+    hasher = hashlib.sha256()
+    hasher.update(TEMPLATE_FILE.read_bytes())
+    hasher.update(pathlib.Path(__file__).read_bytes())
+    return hasher.digest()
+
+
+def entry_cache_key(
+    name: str,
+    docstring: str | None,
+    signature: inspect.Signature | None,
+    is_property: bool,
+) -> str:
+    """Compute the cache key for a single reference entry
+
+    The key covers the entry inputs alongside the template and this script,
+    so changes to either invalidate all previously rendered entries.
+
+    Parameters
+    ----------
+    name : str
+        name of method to document
+    docstring : str | None
+        docstring for this method
+    signature : inspect.Signature | None
+        signature of this method
+    is_property : bool
+        if the method is a class property
+
+    Returns
+    -------
+    str
+        hex digest identifying this entry
+    """
+    hasher = hashlib.sha256(generator_digest())
+    for component in (
+        name.encode(),
+        (docstring or "").encode(),
+        MEMORY_ADDRESS_RE.sub("", f"{signature}").encode(),
+        f"{is_property}".encode(),
+    ):
+        hasher.update(hashlib.sha256(component).digest())
+    return hasher.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def load_template(cache_dir: pathlib.Path | None = None) -> jinja2.Template:
+    """Load the entry template, compiling it at most once per process
+
+    Parameters
+    ----------
+    cache_dir : pathlib.Path | None, optional
+        directory in which to cache compiled template bytecode between
+        processes, by default None (no bytecode cache)
+
+    Returns
+    -------
+    jinja2.Template
+        compiled entry template
+    """
+    bytecode_cache: jinja2.BytecodeCache | None = None
+
+    if cache_dir:
+        cache_dir.joinpath("jinja").mkdir(parents=True, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(
+            f"{cache_dir.joinpath('jinja')}"
+        )
+
+    environment = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_FILE.parent),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+    )
+    return environment.get_template(TEMPLATE_FILE.name)
+
+
+def write_if_changed(output_file: pathlib.Path, content: str | bytes) -> bool:
+    """Atomically write content to a file only if it differs from what is there
+
+    The content is written to a temporary file in the same directory which
+    then replaces the target, so readers never see a partially written file.
+    Leaving unchanged files untouched preserves their modification time so
+    that mkdocs does not rebuild pages which have not changed.
+
+    Parameters
+    ----------
+    output_file : pathlib.Path
+        file to write
+    content : str | bytes
+        new file content, strings are UTF-8 encoded
+
+    Returns
+    -------
+    bool
+        whether the file was written
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    try:
+        if output_file.read_bytes() == content:
+            return False
+        file_mode = output_file.stat().st_mode
+    except FileNotFoundError:
+        file_mode = 0o644
+
+    file_descriptor, temp_file = tempfile.mkstemp(
+        dir=output_file.parent, prefix=f".{output_file.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as out_f:
+            out_f.write(content)
+        os.chmod(temp_file, file_mode)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        pathlib.Path(temp_file).unlink(missing_ok=True)
+        raise
+    return True
 
 
 def format_annotation(annotation) -> str:
@@ -41,12 +281,81 @@ def format_annotation(annotation) -> str:
             return annotation.__name__
     except AttributeError:
         pass
-    return f"{annotation}".replace("typing.", "").replace("Type", "")
+    return MEMORY_ADDRESS_RE.sub(
+        "", f"{annotation}".replace("typing.", "").replace("Type", "")
+    )
+
+
+class ParsedParameter(typing.TypedDict):
+    type: str | None
+    doc_type: str
+    description: str
+    default: str | None
+
+
+class ParsedDocstring(typing.TypedDict):
+    description: list[str] | None
+    returns: list[str] | None
+    raises: list[str] | None
+    parameters: dict[str, ParsedParameter] | None
+    yields: list[str] | None
+    examples: list[str] | None
+    unknown_parameters: list[str] | None
+
+
+class DocstringSection(typing.NamedTuple):
+    name: str
+    indent: int
+    lines: list[str]
+
+
+def tokenize_numpydoc(input_text: str) -> list[DocstringSection]:
+    """Split a Numpydoc docstring into its sections in a single pass
+
+    A line is only treated as a section header if it is one of the known
+    section names and is immediately followed by a dashed underline.
+
+    Parameters
+    ----------
+    input_text : str
+        docstring
+
+    Returns
+    -------
+    list[DocstringSection]
+        sections in order of appearance, starting with the description
+    """
+    sections: list[DocstringSection] = [DocstringSection("description", 0, [])]
+    lines: list[str] = input_text.splitlines()
+    n_lines: int = len(lines)
+    i: int = 0
+
+    while i < n_lines:
+        line = lines[i]
+        stripped = line.strip()
+        if (
+            (section_name := NUMPYDOC_SECTIONS.get(stripped))
+            and i + 1 < n_lines
+            and UNDERLINE_RE.match(lines[i + 1])
+        ):
+            sections.append(
+                DocstringSection(section_name, len(line) - len(line.lstrip()), [])
+            )
+            i += 2
+            continue
+        if stripped and not UNDERLINE_RE.match(line):
+            sections[-1].lines.append(line)
+        i += 1
+
+    return sections
 
 
 def parse_numpydoc(
-    func_name: str, input_text: str, signature: inspect.Signature | None
-) -> dict[str, str | list[str] | dict | None]:
+    func_name: str,
+    input_text: str,
+    signature: inspect.Signature | None,
+    strict: bool = True,
+) -> ParsedDocstring | dict:
     """Parse the Numpydoc docstring
 
     Parameters
@@ -57,120 +366,190 @@ def parse_numpydoc(
         docstring
     signature : inspect.Signature | None
         method signature
+    strict : bool, optional
+        raise an exception for documented parameters missing from the
+        signature, if False these are instead listed under
+        'unknown_parameters', by default True
 
     Returns
     -------
-    dict[str, str | list[str] | dict | None]
-        parsed content
+    ParsedDocstring | dict
+        parsed content, empty if there is no docstring
+
+    Raises
+    ------
+    ValueError
+        if strict and a parameter is not present in the method signature
     """
     if not input_text:
         return {}
 
-    log_section: str = "description"
-
     description: list[str] = []
-    returns: list[str] = []
-    yields: list[str] = []
-    raises: list[str] = []
-    examples: list[str] = []
-    params: dict[str, dict[str, str | None]] = {}
-    indent_level: int | None = None
-
-    for i, line in enumerate(lines := input_text.splitlines()):
-        if "Parameters" in line:
-            log_section = "parameters"
-            continue
-        if "Returns" in line:
-            log_section = "returns"
-            continue
-        if "Yields" in line:
-            log_section = "yields"
-            continue
-        if "Raises" in line:
-            log_section = "raises"
-            continue
-        if "Examples" in line:
-            log_section = "examples"
-            continue
-        line = re.sub(r"-{3,}", "", line)
-
-        if not line.strip():
-            continue
-
-        if log_section == "parameters":
-            current_indent_level = len(line) - len(line.lstrip())
-            if not indent_level:
-                indent_level = current_indent_level
-            if re.findall(r"^\s*[\w\d\_]+\s*:\s*.+", line) and (
-                current_indent_level <= indent_level
-            ):
-                name, type_var = (i.strip() for i in line.split(":"))
-                default_str = None
-                annotation = None
-
-                if signature:
-                    if name not in signature.parameters:
-                        if not name.startswith("*"):
-                            raise ValueError(
-                                f"Unknown parameter '{name}' in docstring for '{func_name}'"
-                            )
-                        annotation = type_var.strip()
-                        if name.startswith("*"):
-                            name = name.replace("*", "")
-                            name = f"_{name}_"
-                    elif (
-                        default := signature.parameters[name].default
-                    ) != inspect._empty:
-                        default_str = f"{default}"
-                    else:
-                        default_str = None
-
-                    if name in signature.parameters:
-                        annotation = format_annotation(
-                            signature.parameters[name].annotation
-                        )
+    params: dict[str, ParsedParameter] = {}
+    unknown: list[str] | None = None if strict else []
+    listed: dict[str, list[str]] = {
+        "returns": [],
+        "yields": [],
+        "raises": [],
+        "examples": [],
+    }
 
-                params[name] = {
-                    "type": annotation,
-                    "description": "",
-                    "default": default_str,
-                }
-            else:
-                if line.strip().startswith("*") and "-" in line:
-                    line_components = line.replace("*", "").split("-")
-                    line = f"&emsp;`{line_components[0].strip()}` - {line_components[1].strip()}"
-                    params[name]["description"] += f"{line}<br>"
-                elif line.startswith(" "):
-                    line_components = line.strip()
-                    params[name]["description"] += f"{line}<br>"
-        elif log_section == "returns":
-            returns.append(line.strip())
-        elif log_section == "yields":
-            yields.append(line.strip())
-        elif log_section == "raises":
-            raises.append(line.strip())
-        elif log_section == "examples":
-            current_indent_level = len(line) - len(line.lstrip())
-            examples.append(
-                f"{(current_indent_level - indent_level) * ' '}{line.strip()}"
-            )
+    for section in tokenize_numpydoc(input_text):
+        if section.name == "parameters":
+            _parse_parameters(func_name, section.lines, signature, params, unknown)
+        elif section.name == "examples":
+            listed["examples"] += [
+                f"{(len(line) - len(line.lstrip()) - section.indent) * ' '}"
+                f"{line.strip()}"
+                for line in section.lines
+            ]
+        elif section.name in listed:
+            listed[section.name] += [line.strip() for line in section.lines]
         else:
-            if re.findall(r"={3,}", line):
-                continue
-            elif i < len(lines) - 1 and re.findall(r"={3,}", lines[i + 1]):
-                line = f"\n#### {line}"
-            description.append(line)
+            for i, line in enumerate(section.lines):
+                if HEADING_UNDERLINE_RE.search(line):
+                    continue
+                if i < len(section.lines) - 1 and HEADING_UNDERLINE_RE.search(
+                    section.lines[i + 1]
+                ):
+                    line = f"\n#### {line}"
+                description.append(line)
 
     return {
         "description": description or None,
-        "returns": returns or None,
-        "raises": raises or None,
+        "returns": listed["returns"] or None,
+        "raises": listed["raises"] or None,
         "parameters": params or None,
-        "yields": yields or None,
-        "examples": examples or None,
+        "yields": listed["yields"] or None,
+        "examples": listed["examples"] or None,
+        "unknown_parameters": unknown or None,
     }
 
 
+def _parse_parameters(
+    func_name: str,
+    lines: list[str],
+    signature: inspect.Signature | None,
+    params: dict[str, ParsedParameter],
+    unknown: list[str] | None = None,
+) -> None:
+    """Parse the lines of a Parameters section
+
+    Parameters
+    ----------
+    func_name : str
+        current method name
+    lines : list[str]
+        non-empty lines within the section
+    signature : inspect.Signature | None
+        method signature
+    params : dict[str, ParsedParameter]
+        parameter entries to update
+    unknown : list[str] | None, optional
+        if provided, names of parameters not present in the method signature
+        are added to this list instead of raising an exception
+
+    Raises
+    ------
+    ValueError
+        if a parameter is not present in the method signature and no
+        unknown list is provided
+    """
+    indent_level: int | None = None
+    name: str | None = None
+
+    for line in lines:
+        current_indent_level = len(line) - len(line.lstrip())
+        if not indent_level:
+            indent_level = current_indent_level
+        if PARAMETER_RE.match(line) and current_indent_level <= indent_level:
+            name, type_var = (i.strip() for i in line.split(":", 1))
+            default_str = None
+            annotation = None
+
+            if signature:
+                if name not in signature.parameters:
+                    if not name.startswith("*") and unknown is not None:
+                        unknown.append(name)
+                        name = None
+                        continue
+                    if not name.startswith("*"):
+                        raise ValueError(
+                            f"Unknown parameter '{name}' in docstring for '{func_name}'"
+                        )
+                    annotation = type_var.strip()
+                    if name.startswith("*"):
+                        name = name.replace("*", "")
+                        name = f"_{name}_"
+                elif (default := signature.parameters[name].default) != inspect._empty:
+                    default_str = f"{default}"
+                else:
+                    default_str = None
+
+                if name in signature.parameters:
+                    annotation = format_annotation(
+                        signature.parameters[name].annotation
+                    )
+
+            params[name] = {
+                "type": annotation,
+                "doc_type": type_var,
+                "description": "",
+                "default": default_str,
+            }
+        elif name is None:
+            continue
+        elif line.strip().startswith("*") and "-" in line:
+            line_components = line.replace("*", "").split("-")
+            line = (
+                f"&emsp;`{line_components[0].strip()}` - {line_components[1].strip()}"
+            )
+            params[name]["description"] += f"{line}<br>"
+        elif line.startswith(" "):
+            params[name]["description"] += f"{line}<br>"
+
+
+def render_markdown(
+    name: str,
+    metadata: ParsedDocstring | dict,
+    is_property: bool,
+    sub_name: str | None = None,
+    sub_label: str | None = None,
+    template: jinja2.Template | None = None,
+) -> str:
+    """Render markdown text for a parsed docstring from jinja2 template
+
+    Parameters
+    ----------
+    name : str
+        name of method to document
+    metadata : ParsedDocstring | dict
+        parsed docstring for this method
+    is_property : bool
+        if the method is a class property
+    sub_name: str | None, optional
+        extra name
+    sub_label: str | None, optional
+        any additional info
+    template : jinja2.Template | None, optional
+        compiled entry template, by default the result of `load_template`
+
+    Returns
+    -------
+    str
+        documentation in markdown
+    """
+    template = template or load_template()
+
+    return template.render(
+        metadata=metadata,
+        function_name=name.replace("_", "\\_"),
+        is_property=is_property,
+        sub_name=sub_name or "",
+        sub_label=sub_label,
+    )
+
+
 def create_markdown(
     name: str,
     docstring: str,
@@ -178,6 +557,7 @@ def create_markdown(
     is_property: bool,
     sub_name: str | None = None,
     sub_label: str | None = None,
+    template: jinja2.Template | None = None,
 ) -> str:
     """Create markdown text from jinja2 template
 
@@ -195,149 +575,1322 @@ def create_markdown(
         extra name
     sub_label: str | None, optional
         any additional info
+    template : jinja2.Template | None, optional
+        compiled entry template, by default the result of `load_template`
 
     Returns
     -------
     str
         documentation in markdown
     """
-    template_file = pathlib.Path(__file__).parent.joinpath("code_entry_markdown.jinja")
-    template = jinja2.Template(template_file.open().read())
-    metadata = parse_numpydoc(name, docstring, signature)
-
-    return template.render(
-        metadata=metadata,
-        function_name=name.replace("_", "\\_"),
+    return render_markdown(
+        name=name,
+        metadata=parse_numpydoc(name, docstring, signature),
         is_property=is_property,
-        sub_name=sub_name or "",
+        sub_name=sub_name,
         sub_label=sub_label,
+        template=template,
     )
 
 
-@click.command
-@click.argument("output_dir", type=click.Path(exists=True))
-@click.argument("mkdocs_cfg", type=click.Path(exists=True))
-def create_client_docs(output_dir: str, mkdocs_cfg: str) -> None:
-    """Create documentation for Client and Run in the given location
+class TargetConfig(typing.TypedDict):
+    label: str
+    target: str
+    section: str | None
+    optional: bool
+    include_inherited: bool
+    exclude: list[str]
+
+
+def load_manifest(manifest_file: pathlib.Path) -> list[TargetConfig]:
+    """Load the list of classes to document from a manifest file
 
     Parameters
     ----------
-    output_dir : str
-        directory to place reference docs
-    mkdocs_cfg : str
-        location of mkdocs configuration file
+    manifest_file : pathlib.Path
+        YAML file listing the classes to document under 'targets'
+
+    Returns
+    -------
+    list[TargetConfig]
+        options for each class with defaults applied
+
+    Raises
+    ------
+    click.ClickException
+        if an entry is missing required keys or has unrecognised options
     """
-    ref_dir = pathlib.Path(output_dir).joinpath("reference")
-    ref_dir.mkdir(exist_ok=True)
+    defaults = {
+        "section": None,
+        "optional": False,
+        "include_inherited": True,
+        "exclude": [],
+    }
+    targets: list[TargetConfig] = []
 
-    mkdocs_cfg_file = pathlib.Path(mkdocs_cfg)
+    for entry in yaml.load(manifest_file.read_text(), Loader=YAML_LOADER)["targets"]:
+        if missing := {"label", "target"} - set(entry):
+            raise click.ClickException(
+                f"Manifest entry {entry} is missing {', '.join(sorted(missing))}"
+            )
+        if unknown := set(entry) - set(defaults) - {"label", "target"}:
+            raise click.ClickException(
+                f"Unrecognised options {', '.join(sorted(unknown))} "
+                f"for '{entry['label']}' in manifest"
+            )
+        targets.append(defaults | entry)
 
-    with mkdocs_cfg_file.open() as in_f:
-        mkdocs_data = yaml.load(in_f, Loader=yaml.UnsafeLoader)
+    return targets
 
-    for i, entry in enumerate(mkdocs_data["nav"]):
-        if "Reference" in entry:
-            mkdocs_data["nav"].pop(i)
-            break
 
-    mkdocs_nav: list[dict[str, str]] = []
-    mkdocs_ll_nav: list[dict[str, str]] = []
+class MemberIR(typing.TypedDict):
+    name: str
+    is_property: bool
+    metadata: ParsedDocstring | dict
+    sub_label: str | None
+    parameters: list[str]
+    return_annotation: str | None
 
-    print(f"Writing reference to '{ref_dir}'")
 
-    for label, module in zip(
-        (
-            "Client",
-            "Run",
-            "api.objects.Run",
-            "api.objects.Artifact",
-            "api.objects.FileArtifact",
-            "api.objects.ObjectArtifact",
-            "api.objects.Metrics",
-            "api.objects.Events",
-            "api.objects.Stats",
-            "api.objects.Storage",
-            "api.objects.S3Storage",
-            "api.objects.FileStorage",
-        ),
-        (
-            Client,
-            Run,
-            RunObject,
-            Artifact,
-            FileArtifact,
-            ObjectArtifact,
-            Metrics,
-            Events,
-            Stats,
-            Storage,
-            S3Storage,
-            FileStorage,
+class ClassIR(typing.TypedDict):
+    label: str
+    file_name: str
+    section: str | None
+    parents: list[str]
+    doc: str | None
+    members: list[MemberIR]
+
+
+def get_member_function(module: type, member: str, is_property: bool):
+    """Retrieve the function documenting a class member
+
+    Parameters
+    ----------
+    module : type
+        class containing the member
+    member : str
+        name of the member
+    is_property : bool
+        if the member is a class property
+
+    Returns
+    -------
+    Callable
+        the method, or getter for a property
+    """
+    function = getattr(module, member)
+    return function.fget if is_property else function
+
+
+def resolve_target(dotted_path: str) -> tuple[type, float, int]:
+    """Import the object at the given dotted path
+
+    Parameters
+    ----------
+    dotted_path : str
+        path to the object, e.g. 'simvue.api.objects.Run'
+
+    Returns
+    -------
+    tuple[type, float, int]
+        the imported object, the time taken to import it in seconds and the
+        number of modules newly imported as a result
+    """
+    module_path, _, attribute = dotted_path.rpartition(".")
+    n_modules: int = len(sys.modules)
+    start = time.perf_counter()
+    try:
+        target = getattr(importlib.import_module(module_path), attribute)
+    except (ImportError, AttributeError) as e:
+        raise click.ClickException(f"Failed to import '{dotted_path}': {e}") from e
+    return target, time.perf_counter() - start, len(sys.modules) - n_modules
+
+
+def introspect_entry(
+    module: type, member: str, is_property: bool, cache_dir: pathlib.Path | None
+) -> CachedEntry:
+    """Parse and render the documentation for a single class member
+
+    This is the unit of work dispatched to worker processes, the class is
+    passed by reference and the member re-resolved within the worker.
+
+    Parameters
+    ----------
+    module : type
+        class containing the member
+    member : str
+        name of the member
+    is_property : bool
+        if the member is a class property
+    cache_dir : pathlib.Path | None
+        directory containing the template bytecode cache
+
+    Returns
+    -------
+    CachedEntry
+        parsed docstring and documentation in markdown
+    """
+    function = get_member_function(module, member, is_property)
+    metadata = parse_numpydoc(
+        member, function.__doc__, inspect.signature(function), strict=False
+    )
+    return {
+        "metadata": metadata,
+        "markdown": render_markdown(
+            name=member,
+            metadata=metadata,
+            is_property=is_property,
+            template=load_template(cache_dir),
         ),
-    ):
+    }
+
+
+def introspect_classes(
+    targets: list[tuple[TargetConfig, type]],
+    entry_cache: EntryCache,
+    link_inherited: bool,
+    jobs: int,
+    cache_dir: pathlib.Path | None,
+    documented: set[type] | None = None,
+) -> tuple[list[ClassIR], dict[str, str]]:
+    """Build the intermediate representation for each documented class
+
+    Members are identified by a content hash, only those missing from the
+    cache are parsed and rendered, optionally across a process pool.
+
+    Parameters
+    ----------
+    targets : list[tuple[TargetConfig, type]]
+        options and class for each class to document
+    entry_cache : EntryCache
+        cache of previously parsed and rendered entries
+    link_inherited : bool
+        link to the first page documenting an inherited member instead of
+        repeating it
+    jobs : int
+        number of processes used to parse and render entries
+    cache_dir : pathlib.Path | None
+        directory containing the template bytecode cache
+    documented : set[type] | None, optional
+        every class in the reference, used to exclude inherited members when
+        only some of the classes are being introspected, by default the
+        classes of the given targets
+
+    Returns
+    -------
+    tuple[list[ClassIR], dict[str, str]]
+        representation of each class, and rendered markdown for each
+        member of each class in order
+    """
+    class_irs: list[ClassIR] = []
+    member_keys_ordered: list[list[str | None]] = []
+    pending: dict[str, tuple[type, str, bool]] = {}
+
+    # Cache key and signature summary of each distinct member function and the
+    # first page on which it is documented, keyed by the function itself so that
+    # it stays alive and its identity cannot be reused by another function
+    member_keys: dict[tuple[str, str, object], tuple[str, list[str], str | None]] = {}
+    first_documented: dict[tuple[str, str, object], tuple[str, str]] = {}
+
+    if documented is None:
+        documented = {module for _, module in targets}
+
+    for target, module in targets:
+        label: str = target["label"]
         # Include initialisation method
         methods: list[str] = ["__init__"]
-        methods += [i for i in dir(module) if not i.startswith("_")]
+        methods += [
+            i
+            for i in dir(module)
+            if not i.startswith("_")
+            and i not in target["exclude"]
+            and (
+                callable(attribute := getattr(module, i))
+                or isinstance(attribute, property)
+            )
+        ]
         properties = [i for i in methods if isinstance(getattr(module, i), property)]
-        parent_class_str: str = ""
+        file_name: str = f"{label.replace('.', '_').lower()}.md"
 
-        if len(module.__mro__) > 1:
-            parent_class_str = " > ".join(
-                f"`{i.__name__}`"
-                for i in reversed(module.__mro__[1:])
-                if i is not object
-            )
+        class_ir: ClassIR = {
+            "label": label,
+            "file_name": file_name,
+            "section": target["section"],
+            "parents": [
+                i.__name__ for i in reversed(module.__mro__[1:]) if i is not object
+            ],
+            "doc": module.__doc__,
+            "members": [],
+        }
+        class_irs.append(class_ir)
+        member_keys_ordered.append(keys := [])
 
-        file_name: str = f"{label.replace('.', '_').lower()}.md"
-        output_file = ref_dir.joinpath(file_name)
+        members: list[tuple[str, bool]] = [
+            (method, False) for method in methods if method not in properties
+        ]
+        members += [(prop, True) for prop in properties]
 
-        if "api.objects" in label:
-            _entry = {label: f"reference/{file_name}"}
-            mkdocs_ll_nav.append(_entry)
+        for member, is_property in members:
+            function = get_member_function(module, member, is_property)
+            defining_class = next(
+                (i for i in module.__mro__ if member in i.__dict__), module
+            )
+
+            if not target["include_inherited"] and defining_class in documented - {
+                module
+            }:
+                continue
+
+            # Bound methods such as classmethods are created on each access, so
+            # the underlying function is used to identify them
+            member_id = (
+                member,
+                getattr(function, "__qualname__", member),
+                getattr(function, "__func__", function),
+            )
+            if (member_info := member_keys.get(member_id)) is None:
+                signature = inspect.signature(function)
+                member_info = member_keys[member_id] = (
+                    entry_cache_key(member, function.__doc__, signature, is_property),
+                    [
+                        name
+                        for i, (name, parameter) in enumerate(
+                            signature.parameters.items()
+                        )
+                        if not (i == 0 and name in ("self", "cls"))
+                        and parameter.kind
+                        not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)
+                    ],
+                    (
+                        None
+                        if signature.return_annotation is signature.empty
+                        else format_annotation(signature.return_annotation)
+                    ),
+                )
+            cache_key, parameters, return_annotation = member_info
+
+            member_ir: MemberIR = {
+                "name": member,
+                "is_property": is_property,
+                "metadata": {},
+                "sub_label": None,
+                "parameters": parameters,
+                "return_annotation": return_annotation,
+            }
+            class_ir["members"].append(member_ir)
+
+            if (
+                link_inherited
+                and defining_class is not module
+                and (documented_in := first_documented.get(member_id))
+            ):
+                member_ir["sub_label"] = (
+                    f"*Inherited from `{defining_class.__name__}`, "
+                    f"see [`{documented_in[0]}`]"
+                    f"({documented_in[1]}#{member.lower()})*"
+                )
+                keys.append(None)
+                continue
+
+            first_documented.setdefault(member_id, (label, file_name))
+
+            if cache_key not in pending and entry_cache.get(cache_key) is None:
+                pending[cache_key] = (module, member, is_property)
+            keys.append(cache_key)
+
+    if jobs > 1 and len(pending) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(
+                introspect_entry,
+                *zip(*pending.values()),
+                [cache_dir] * len(pending),
+                chunksize=max(1, len(pending) // (4 * jobs)),
+            )
+            for cache_key, result in zip(pending, results):
+                entry_cache.set(cache_key, result)
+    else:
+        for cache_key, (module, member, is_property) in pending.items():
+            entry_cache.set(
+                cache_key, introspect_entry(module, member, is_property, cache_dir)
+            )
+
+    rendered: dict[str, str] = {}
+
+    for class_ir, keys in zip(class_irs, member_keys_ordered):
+        for member_ir, cache_key in zip(class_ir["members"], keys):
+            if cache_key is None:
+                continue
+            cached = entry_cache.get(cache_key)
+            member_ir["metadata"] = cached["metadata"]
+            rendered[f"{class_ir['label']}.{member_ir['name']}"] = cached["markdown"]
+
+    n_entries = len({cache_key for cache_key, *_ in member_keys.values()})
+    print(f"Parsed {len(pending)} of {n_entries} distinct entries")
+
+    return class_irs, rendered
+
+
+def render_page(
+    class_ir: ClassIR,
+    template: jinja2.Template,
+    rendered: dict[str, str] | None = None,
+) -> str:
+    """Render the reference page for a class from its representation
+
+    Parameters
+    ----------
+    class_ir : ClassIR
+        intermediate representation of the class
+    template : jinja2.Template
+        compiled entry template
+    rendered : dict[str, str] | None, optional
+        previously rendered markdown for members, keyed by class label and
+        member name, by default None
+
+    Returns
+    -------
+    str
+        page content in markdown
+    """
+    rendered = rendered or {}
+    page: list[str] = [f"# The `{class_ir['label']}` class\n"]
+    if class_ir["parents"]:
+        parent_class_str = " > ".join(f"`{i}`" for i in class_ir["parents"])
+        page.append(f"*Inherits from {parent_class_str}*\n\n")
+    page.append(f"{class_ir['doc'] or ' '}\n")
+    page.append("## Methods\n")
+
+    properties_started: bool = False
+
+    for member_ir in class_ir["members"]:
+        if member_ir["is_property"] and not properties_started:
+            page.append("## Properties\n")
+            properties_started = True
+        if (doc := rendered.get(f"{class_ir['label']}.{member_ir['name']}")) is None:
+            doc = render_markdown(
+                name=member_ir["name"],
+                metadata=member_ir["metadata"],
+                is_property=member_ir["is_property"],
+                sub_label=member_ir["sub_label"],
+                template=template,
+            )
+        page.append(doc)
+        page.append("----\n")
+
+    return "".join(page)
+
+
+def resolve_targets(
+    manifest_file: pathlib.Path, import_time_report: bool
+) -> list[tuple[TargetConfig, type]]:
+    """Import the classes listed in the manifest
+
+    Parameters
+    ----------
+    manifest_file : pathlib.Path
+        YAML file listing the classes to document
+    import_time_report : bool
+        print the time taken to import each target
+
+    Returns
+    -------
+    list[tuple[TargetConfig, type]]
+        options and class for each class to document, excluding optional
+        targets which could not be imported
+    """
+    targets: list[tuple[TargetConfig, type]] = []
+    import_times: list[tuple[str, float, int]] = []
+
+    for target in load_manifest(manifest_file):
+        try:
+            module, import_time, n_modules = resolve_target(target["target"])
+        except click.ClickException as e:
+            if not target["optional"]:
+                raise
+            print(f"Skipping optional target: {e.message}")
+            continue
+        targets.append((target, module))
+        import_times.append((target["target"], import_time, n_modules))
+
+    if import_time_report:
+        print(f"{'Target':<40} {'Time [ms]':>10} {'Modules':>8}")
+        for dotted_path, import_time, n_modules in import_times:
+            print(f"{dotted_path:<40} {1000 * import_time:>10.1f} {n_modules:>8}")
+        print(
+            f"{'Total':<40} {1000 * sum(i[1] for i in import_times):>10.1f} "
+            f"{sum(i[2] for i in import_times):>8}"
+        )
+
+    return targets
+
+
+class ValidationIssue(typing.TypedDict):
+    target: str
+    member: str
+    kind: str
+    message: str
+
+
+def _split_top_level(type_str: str, separator: str) -> list[str]:
+    """Split a type string on a separator outside of any brackets
+
+    Parameters
+    ----------
+    type_str : str
+        type string to split
+    separator : str
+        single character on which to split
+
+    Returns
+    -------
+    list[str]
+        components of the type string
+    """
+    components: list[str] = [""]
+    depth: int = 0
+
+    for character in type_str:
+        if character == separator and not depth:
+            components.append("")
+            continue
+        depth += (character == "[") - (character == "]")
+        components[-1] += character
+
+    return components
+
+
+def _normalise_type(type_str: str) -> frozenset[str]:
+    """Normalise a type string for comparison
+
+    Whitespace, module prefixes and `Annotated` metadata are discarded and
+    `Optional`, `Union` and `Literal` are expanded, so that documented and
+    annotated forms of the same type compare equal.
+
+    Parameters
+    ----------
+    type_str : str
+        type from a docstring or annotation
+
+    Returns
+    -------
+    frozenset[str]
+        members of the union described by the type
+    """
+    type_str = CLASS_REPR_RE.sub(r"\1", type_str).replace(" ", "").replace('"', "'")
+    type_str = MODULE_PREFIX_RE.sub("", OPTIONAL_MARKER_RE.sub("", type_str))
+    members: set[str] = set()
+
+    for member in _split_top_level(type_str, "|"):
+        if not (generic := GENERIC_TYPE_RE.fullmatch(member)):
+            members.add(member)
+            continue
+        origin, arguments = generic.groups()
+        if origin == "Annotated":
+            members |= _normalise_type(_split_top_level(arguments, ",")[0])
+        elif origin in ("Optional", "Union"):
+            members |= _normalise_type("|".join(_split_top_level(arguments, ",")))
+            members |= {"None"} if origin == "Optional" else set()
+        elif origin == "Literal":
+            members |= set(_split_top_level(arguments, ","))
         else:
-            _entry = {f"The {label} class": f"reference/{file_name}"}
-            mkdocs_nav.append(_entry)
+            arguments = ",".join(
+                "|".join(sorted(_normalise_type(argument)))
+                for argument in _split_top_level(arguments, ",")
+            )
+            members.add(f"{origin}[{arguments}]")
+
+    return frozenset(members)
+
 
-        with output_file.open("w") as out_f:
-            out_f.write(f"# The `{label}` class\n")
-            if parent_class_str:
-                out_f.write(f"*Inherits from {parent_class_str}*\n\n")
-            out_f.write(f"{module.__doc__ or ' '}\n")
-            out_f.write("## Methods\n")
-            for method in methods:
-                if method in properties:
+def validate_classes(class_irs: list[ClassIR]) -> list[ValidationIssue]:
+    """Check the documentation of every member against its signature
+
+    Parameters
+    ----------
+    class_irs : list[ClassIR]
+        representation of each class
+
+    Returns
+    -------
+    list[ValidationIssue]
+        all issues found, in page order
+    """
+    issues: list[ValidationIssue] = []
+
+    for class_ir in class_irs:
+        for member_ir in class_ir["members"]:
+            # Members linked to another page are validated there
+            if member_ir["sub_label"]:
+                continue
+
+            def _issue(kind: str, message: str) -> None:
+                issues.append(
+                    {
+                        "target": class_ir["label"],
+                        "member": member_ir["name"],
+                        "kind": kind,
+                        "message": message,
+                    }
+                )
+
+            if not (metadata := member_ir["metadata"]):
+                _issue("missing-docstring", "no docstring")
+                continue
+
+            documented = metadata["parameters"] or {}
+
+            for name in metadata["unknown_parameters"] or []:
+                _issue("unknown-parameter", f"'{name}' is not in the signature")
+
+            for name in member_ir["parameters"]:
+                if name not in documented:
+                    _issue("undocumented-parameter", f"'{name}' is not documented")
+
+            for name, parameter in documented.items():
+                if not parameter["type"] or "_empty" in parameter["type"]:
                     continue
-                method_docstr: str = getattr(module, method).__doc__
-                method_signature: inspect.Signature = inspect.signature(
-                    getattr(module, method)
+                annotated = _normalise_type(parameter["type"])
+                doc_type = _normalise_type(parameter["doc_type"])
+                # An optional parameter may omit 'None' from its documented type
+                if annotated != doc_type and not (
+                    OPTIONAL_MARKER_RE.search(parameter["doc_type"])
+                    and annotated == doc_type | {"None"}
+                ):
+                    _issue(
+                        "type-mismatch",
+                        f"'{name}' documented as '{parameter['doc_type']}' "
+                        f"but annotated as '{parameter['type']}'",
+                    )
+
+            # Properties describe their value in the summary instead
+            if (
+                not member_ir["is_property"]
+                and member_ir["name"] != "__init__"
+                and member_ir["return_annotation"] not in (None, "None")
+                and not (metadata["returns"] or metadata["yields"])
+            ):
+                _issue(
+                    "missing-returns",
+                    f"returns '{member_ir['return_annotation']}' "
+                    "but has no Returns section",
                 )
-                doc = create_markdown(
-                    name=method,
-                    docstring=method_docstr,
-                    signature=method_signature,
-                    is_property=False,
+
+    return issues
+
+
+def write_pages(
+    class_irs: list[ClassIR],
+    ref_dir: pathlib.Path,
+    template: jinja2.Template,
+    rendered: dict[str, str],
+) -> int:
+    """Render and write the reference page for each class
+
+    Parameters
+    ----------
+    class_irs : list[ClassIR]
+        representation of each class
+    ref_dir : pathlib.Path
+        directory in which to write the pages
+    template : jinja2.Template
+        compiled entry template
+    rendered : dict[str, str]
+        previously rendered markdown for members
+
+    Returns
+    -------
+    int
+        number of pages whose content changed
+    """
+    return sum(
+        write_if_changed(
+            ref_dir.joinpath(class_ir["file_name"]),
+            render_page(class_ir, template, rendered),
+        )
+        for class_ir in class_irs
+    )
+
+
+def build_search_shard(class_ir: ClassIR) -> dict:
+    """Build the inverted search index for the members of a class
+
+    Each member is indexed by its name, parameter names, parameter and return
+    types and the first line of its description.
+
+    Parameters
+    ----------
+    class_ir : ClassIR
+        representation of the class
+
+    Returns
+    -------
+    dict
+        the page for the class, its members as (name, anchor, summary) and a
+        mapping from each term to the indices of the members containing it
+    """
+    entries: list[tuple[str, str, str]] = []
+    terms: dict[str, set[int]] = {}
+
+    for index, member_ir in enumerate(class_ir["members"]):
+        metadata = member_ir["metadata"] or {}
+        summary = next((i for i in metadata.get("description") or [] if i), "")
+        parameters = metadata.get("parameters") or {}
+        indexed: list[str] = [
+            member_ir["name"],
+            summary,
+            *(metadata.get("returns") or [])[:1],
+            member_ir["return_annotation"] or "",
+        ]
+
+        for name, parameter in parameters.items():
+            indexed += [name, parameter["type"]]
+
+        words = {member_ir["name"].lower(), *parameters}
+        for text in indexed:
+            words.update(SEARCH_TOKEN_RE.findall(text.lower()))
+
+        for word in words:
+            terms.setdefault(word, set()).add(index)
+
+        entries.append((member_ir["name"], member_ir["name"].lower(), summary))
+
+    return {
+        "label": class_ir["label"],
+        "page": class_ir["file_name"],
+        "entries": entries,
+        "terms": {term: sorted(terms[term]) for term in sorted(terms)},
+    }
+
+
+def write_search_index(
+    search_dir: pathlib.Path, class_irs: list[ClassIR], partial: bool = False
+) -> None:
+    """Write the prebuilt API reference search index
+
+    The index is sharded by class, with a small top level file listing the
+    shards and, for each term prefix, the shards containing a term starting
+    with it, so that a page need only fetch the shards matching a query.
+
+    Parameters
+    ----------
+    search_dir : pathlib.Path
+        directory in which to write the index
+    class_irs : list[ClassIR]
+        representation of each class
+    partial : bool, optional
+        only the given classes have changed, so write their shards and update
+        their entries in the existing top level file, by default False
+    """
+    search_dir.mkdir(parents=True, exist_ok=True)
+    index_file = search_dir.joinpath("index.json")
+
+    index: dict[str, typing.Any] = (
+        json.loads(index_file.read_text())
+        if partial and index_file.exists()
+        else {"shards": [], "routes": {}}
+    )
+    shard_numbers: dict[str, int] = {
+        shard["shard"]: i for i, shard in enumerate(index["shards"])
+    }
+    routes: dict[str, set[int]] = {
+        prefix: set(shards) for prefix, shards in index["routes"].items()
+    }
+
+    for class_ir in class_irs:
+        shard_file = f"{pathlib.Path(class_ir['file_name']).stem}.json"
+        shard = build_search_shard(class_ir)
+        write_if_changed(
+            search_dir.joinpath(shard_file),
+            json.dumps(shard, separators=(",", ":")),
+        )
+
+        if (number := shard_numbers.get(shard_file)) is None:
+            number = shard_numbers[shard_file] = len(index["shards"])
+            index["shards"].append(
+                {
+                    "label": class_ir["label"],
+                    "page": class_ir["file_name"],
+                    "shard": shard_file,
+                }
+            )
+
+        for shards in routes.values():
+            shards.discard(number)
+        for term in shard["terms"]:
+            routes.setdefault(term[:SEARCH_ROUTE_LENGTH], set()).add(number)
+
+    index["prefix_length"] = SEARCH_ROUTE_LENGTH
+    index["routes"] = {
+        prefix: sorted(shards) for prefix, shards in sorted(routes.items()) if shards
+    }
+    write_if_changed(index_file, json.dumps(index, separators=(",", ":")))
+
+
+def target_source_files(
+    targets: list[tuple[TargetConfig, type]],
+) -> dict[pathlib.Path, set[str]]:
+    """Map source files to the labels of the targets which depend on them
+
+    A target depends on the files defining its class and each of its bases.
+
+    Parameters
+    ----------
+    targets : list[tuple[TargetConfig, type]]
+        options and class for each documented class
+
+    Returns
+    -------
+    dict[pathlib.Path, set[str]]
+        labels of dependent targets for each source file
+    """
+    source_files: dict[pathlib.Path, set[str]] = {}
+
+    for target, module in targets:
+        for cls in module.__mro__:
+            try:
+                source_file = inspect.getsourcefile(cls)
+            except TypeError:
+                continue
+            if source_file:
+                source_files.setdefault(pathlib.Path(source_file).resolve(), set()).add(
+                    target["label"]
                 )
-                out_f.write(doc)
-                out_f.write("----\n")
-            if properties:
-                out_f.write("## Properties\n")
-            for prop in properties:
-                getter_docstring: str = getattr(module, prop).fget.__doc__
-                getter_signature: inspect.signature = inspect.signature(
-                    getattr(module, prop).fget
+
+    return source_files
+
+
+def reload_targets(
+    changed_files: set[pathlib.Path],
+    targets: list[tuple[TargetConfig, type]],
+    labels: set[str],
+) -> list[tuple[TargetConfig, type]]:
+    """Reload the modules affected by changed files and re-resolve targets
+
+    Changed modules are reloaded first, followed by the modules defining the
+    classes of each affected target from base to derived class, and finally
+    the modules the targets are imported from, so re-exported names are
+    also refreshed.
+
+    Parameters
+    ----------
+    changed_files : set[pathlib.Path]
+        source files which have changed
+    targets : list[tuple[TargetConfig, type]]
+        options and class for each documented class
+    labels : set[str]
+        labels of the targets affected by the changes
+
+    Returns
+    -------
+    list[tuple[TargetConfig, type]]
+        all targets, with the affected targets resolved again
+    """
+    to_reload: list[str] = [
+        name
+        for name, module in list(sys.modules.items())
+        if getattr(module, "__file__", None)
+        and pathlib.Path(module.__file__).resolve() in changed_files
+    ]
+
+    for target, module in targets:
+        if target["label"] not in labels:
+            continue
+        to_reload += [
+            cls.__module__ for cls in reversed(module.__mro__) if cls is not object
+        ]
+        to_reload.append(target["target"].rpartition(".")[0])
+
+    for name in dict.fromkeys(to_reload):
+        if name in sys.modules and name != "builtins":
+            importlib.reload(sys.modules[name])
+
+    return [
+        (
+            (target, resolve_target(target["target"])[0])
+            if target["label"] in labels
+            else (target, module)
+        )
+        for target, module in targets
+    ]
+
+
+def watch_targets(
+    targets: list[tuple[TargetConfig, type]],
+    regenerate: typing.Callable[[list[tuple[TargetConfig, type]], set[str]], None],
+    debounce: float = 0.1,
+) -> None:
+    """Watch the source of the documented classes and regenerate on change
+
+    Parameters
+    ----------
+    targets : list[tuple[TargetConfig, type]]
+        options and class for each documented class
+    regenerate : Callable[[list[tuple[TargetConfig, type]], set[str]], None]
+        called with the reloaded targets and the labels of those affected
+    debounce : float, optional
+        time in seconds to wait for further changes after the first, by
+        default 0.1
+    """
+    source_files = target_source_files(targets)
+    changes: queue.Queue[pathlib.Path] = queue.Queue()
+
+    class _ChangeHandler(watchdog.events.FileSystemEventHandler):
+        def on_any_event(self, event: watchdog.events.FileSystemEvent) -> None:
+            if event.event_type in ("modified", "created", "moved"):
+                changes.put(
+                    pathlib.Path(
+                        f"{getattr(event, 'dest_path', '') or event.src_path}"
+                    ).resolve()
                 )
-                doc = create_markdown(
-                    name=prop,
-                    docstring=getter_docstring,
-                    signature=getter_signature,
-                    is_property=True,
+
+    observer = watchdog.observers.Observer()
+    for directory in {source_file.parent for source_file in source_files}:
+        observer.schedule(_ChangeHandler(), f"{directory}", recursive=False)
+    observer.start()
+
+    print(f"Watching {len(source_files)} source files for changes, Ctrl+C to stop")
+
+    try:
+        while True:
+            changed_files: set[pathlib.Path] = {changes.get()}
+            time.sleep(debounce)
+            while not changes.empty():
+                changed_files.add(changes.get())
+            if not (changed_files := changed_files & set(source_files)):
+                continue
+
+            start = time.perf_counter()
+            labels = set().union(*(source_files[i] for i in changed_files))
+
+            try:
+                targets = reload_targets(changed_files, targets, labels)
+                regenerate(targets, labels)
+            except Exception as e:
+                print(f"Failed to regenerate reference: {e}")
+                continue
+
+            source_files = target_source_files(targets)
+            print(
+                f"Regenerated {', '.join(sorted(labels))} "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def patch_mkdocs_nav(config_text: str, reference_nav: list[dict]) -> str:
+    """Replace the 'Reference' entry of the mkdocs navigation
+
+    Only the lines making up the 'Reference' entry are rewritten, leaving
+    the rest of the configuration (including comments, key order and tags)
+    untouched. If there is no existing entry it is added to the end of the
+    navigation.
+
+    Parameters
+    ----------
+    config_text : str
+        content of the mkdocs configuration file
+    reference_nav : list[dict]
+        navigation entries to place under 'Reference'
+
+    Returns
+    -------
+    str
+        updated configuration file content
+
+    Raises
+    ------
+    click.ClickException
+        if the navigation is not a block sequence under a top level 'nav' key
+    """
+    lines: list[str] = config_text.splitlines(keepends=True)
+
+    try:
+        nav_start = next(i for i, line in enumerate(lines) if line.rstrip() == "nav:")
+    except StopIteration as e:
+        raise click.ClickException("No top level 'nav' found in mkdocs config") from e
+
+    # Locate the extent of the navigation, and its top level entries
+    item_indent: int | None = None
+    nav_end: int = len(lines)
+    items: list[int] = []
+
+    for i in range(nav_start + 1, len(lines)):
+        stripped = lines[i].lstrip()
+        if not stripped.strip() or stripped.startswith("#"):
+            continue
+        indent = len(lines[i]) - len(stripped)
+        if item_indent is None:
+            item_indent = indent
+        if indent < item_indent or (
+            indent == item_indent and not stripped.startswith("- ")
+        ):
+            nav_end = i
+            break
+        if indent == item_indent:
+            items.append(i)
+
+    if item_indent is None:
+        raise click.ClickException("Navigation in mkdocs config is not a list")
+
+    def _content_end(start: int, end: int) -> int:
+        # End of a range of lines, excluding trailing blank lines and comments
+        while end > start + 1 and (
+            not (stripped := lines[end - 1].strip()) or stripped.startswith("#")
+        ):
+            end -= 1
+        return end
+
+    # Do not absorb blank lines or comments following the navigation
+    nav_end = _content_end(nav_start, nav_end)
+
+    reference_block = yaml.dump(
+        [{"Reference": reference_nav}], Dumper=YAML_DUMPER, sort_keys=False
+    )
+    reference_lines = [
+        f"{' ' * item_indent}{line}\n" for line in reference_block.splitlines()
+    ]
+
+    start, end = nav_end, nav_end
+    for i, item_start in enumerate(items):
+        if lines[item_start].strip().startswith("- Reference:"):
+            start = item_start
+            # Comments before the next entry are left in place
+            end = _content_end(start, items[i + 1] if i + 1 < len(items) else nav_end)
+            break
+
+    lines[start:end] = reference_lines
+    patched_text = "".join(lines)
+
+    # Check the patched navigation is still a valid list of entries
+    nav_end += len(reference_lines) - (end - start)
+    if not isinstance(
+        yaml.load("".join(lines[nav_start + 1 : nav_end]), Loader=YAML_LOADER), list
+    ):
+        raise click.ClickException("Failed to patch navigation in mkdocs config")
+
+    return patched_text
+
+
+def write_ir(
+    ir_dir: pathlib.Path,
+    class_irs: list[ClassIR],
+    ir_format: str,
+    classes_only: bool = False,
+    simvue_version: str | None = None,
+) -> None:
+    """Write the intermediate representation, one file per class
+
+    An index file records the order of classes and the simvue version.
+
+    Parameters
+    ----------
+    ir_dir : pathlib.Path
+        directory in which to write the representation
+    class_irs : list[ClassIR]
+        representation of each class
+    ir_format : str
+        either 'json' or 'msgpack'
+    classes_only : bool, optional
+        only write the files for the given classes, leaving the index
+        unchanged, by default False
+    simvue_version : str | None, optional
+        simvue version to record in the index, by default the installed
+        version
+    """
+    ir_dir.mkdir(parents=True, exist_ok=True)
+    index: dict[str, typing.Any] = {"format": ir_format, "classes": []}
+    for class_ir in class_irs:
+        file_name = f"{pathlib.Path(class_ir['file_name']).stem}.{ir_format}"
+        if ir_format == "msgpack":
+            content = msgpack.packb(class_ir)
+        else:
+            content = json.dumps(class_ir, separators=(",", ":"))
+        write_if_changed(ir_dir.joinpath(file_name), content)
+        index["classes"].append(file_name)
+    if not classes_only:
+        index = {
+            "simvue_version": simvue_version or importlib.metadata.version("simvue"),
+            **index,
+        }
+        write_if_changed(ir_dir.joinpath("index.json"), json.dumps(index, indent=2))
+
+
+def read_ir(ir_dir: pathlib.Path) -> tuple[list[ClassIR], str]:
+    """Read an intermediate representation written by `write_ir`
+
+    Parameters
+    ----------
+    ir_dir : pathlib.Path
+        directory containing the representation
+
+    Returns
+    -------
+    list[ClassIR]
+        representation of each class in order
+    str
+        simvue version the representation was generated from
+    """
+    index = json.loads(ir_dir.joinpath("index.json").read_text())
+    if index["format"] == "msgpack" and not msgpack:
+        raise click.ClickException("Reading msgpack IR requires 'msgpack'")
+    return [
+        (
+            msgpack.unpackb(ir_dir.joinpath(file_name).read_bytes())
+            if index["format"] == "msgpack"
+            else json.loads(ir_dir.joinpath(file_name).read_text())
+        )
+        for file_name in index["classes"]
+    ], index["simvue_version"]
+
+
+@click.command
+@click.argument("output_dir", type=click.Path(exists=True))
+@click.argument("mkdocs_cfg", type=click.Path(exists=True))
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    default=f"{MANIFEST_FILE}",
+    show_default=True,
+    help="YAML file listing the classes to document",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=f"{CACHE_DIR}",
+    show_default=True,
+    help="Directory in which to cache rendered entries between runs",
+)
+@click.option("--no-cache", is_flag=True, help="Render all entries from scratch")
+@click.option(
+    "--link-inherited",
+    is_flag=True,
+    help="Link to the first page documenting an inherited member",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes used to render entries",
+)
+@click.option(
+    "--ir-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory in which to write the intermediate representation",
+)
+@click.option(
+    "--ir-format",
+    type=click.Choice(["json", "msgpack"]),
+    default="json",
+    show_default=True,
+    help="Format of the intermediate representation",
+)
+@click.option(
+    "--from-ir",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help="Render pages from an existing intermediate representation",
+)
+@click.option(
+    "--import-time",
+    "import_time_report",
+    is_flag=True,
+    help="Report the time taken to import each documented target",
+)
+@click.option(
+    "--validate",
+    "validate_format",
+    type=click.Choice(["text", "json"]),
+    default=None,
+    help="Check docstrings against signatures and report all issues "
+    "in the given format instead of writing pages",
+)
+@click.option(
+    "--search-index",
+    is_flag=True,
+    help="Write a prebuilt search index of the reference members, sharded by "
+    "class, alongside the pages",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Regenerate pages when the source of documented classes changes",
+)
+def create_client_docs(
+    output_dir: str,
+    mkdocs_cfg: str,
+    manifest: str,
+    cache_dir: str,
+    no_cache: bool,
+    link_inherited: bool,
+    jobs: int,
+    ir_dir: str | None,
+    ir_format: str,
+    from_ir: str | None,
+    import_time_report: bool,
+    validate_format: str | None,
+    search_index: bool,
+    watch: bool,
+) -> None:
+    """Create documentation for Client and Run in the given location
+
+    Parameters
+    ----------
+    output_dir : str
+        directory to place reference docs
+    mkdocs_cfg : str
+        location of mkdocs configuration file
+    manifest : str
+        YAML file listing the classes to document
+    cache_dir : str
+        directory in which to cache rendered entries between runs
+    no_cache : bool
+        disable reading and writing of the entry cache
+    link_inherited : bool
+        link to the first page documenting an inherited member instead of
+        repeating it
+    jobs : int
+        number of processes used to render entries
+    ir_dir : str | None
+        directory in which to write the intermediate representation
+    ir_format : str
+        format of the intermediate representation
+    from_ir : str | None
+        render pages from the intermediate representation in this directory
+        instead of introspecting simvue
+    import_time_report : bool
+        print the time taken to import each documented target
+    validate_format : str | None
+        if set, validate docstrings against signatures and report issues in
+        this format ('text' or 'json') instead of writing pages, exiting
+        with a non-zero code if any are found
+    search_index : bool
+        write a prebuilt search index sharded by class alongside the pages
+    watch : bool
+        after generating, watch the source files of the documented classes
+        and regenerate the affected pages when they change
+    """
+    if ir_format == "msgpack" and not msgpack:
+        raise click.ClickException("Writing msgpack IR requires 'msgpack'")
+    if watch and not watchdog:
+        raise click.ClickException("Watching for changes requires 'watchdog'")
+    if watch and from_ir:
+        raise click.ClickException("Cannot watch for changes when rendering from IR")
+
+    ref_dir = pathlib.Path(output_dir).joinpath("reference")
+    ref_dir.mkdir(exist_ok=True)
+
+    mkdocs_cfg_file = pathlib.Path(mkdocs_cfg)
+    cache_path = None if no_cache else pathlib.Path(cache_dir)
+    template = load_template(cache_path)
+    rendered: dict[str, str] = {}
+
+    mkdocs_nav: list[dict[str, str]] = []
+    mkdocs_sub_navs: dict[str, list[dict[str, str]]] = {}
+
+    # Keep progress messages out of machine readable validation output
+    with contextlib.redirect_stdout(
+        sys.stderr if validate_format == "json" else sys.stdout
+    ):
+        # The simvue version is only looked up when introspecting, so an IR
+        # can be converted where simvue is not installed
+        simvue_version: str | None = None
+        if from_ir:
+            class_irs, simvue_version = read_ir(pathlib.Path(from_ir))
+        else:
+            entry_cache = EntryCache(cache_path)
+            targets = resolve_targets(pathlib.Path(manifest), import_time_report)
+            class_irs, rendered = introspect_classes(
+                targets=targets,
+                entry_cache=entry_cache,
+                link_inherited=link_inherited,
+                jobs=jobs,
+                cache_dir=cache_path,
+            )
+            entry_cache.save()
+
+    if ir_dir:
+        write_ir(
+            pathlib.Path(ir_dir), class_irs, ir_format, simvue_version=simvue_version
+        )
+
+    if validate_format:
+        issues = validate_classes(class_irs)
+        if validate_format == "json":
+            print(json.dumps(issues, indent=2))
+        else:
+            for issue in issues:
+                print(
+                    f"{issue['target']}.{issue['member']}: "
+                    f"{issue['kind']}: {issue['message']}"
                 )
-                out_f.write(doc)
-                out_f.write("----\n")
-    mkdocs_nav.append({"Low Level API": mkdocs_ll_nav})
-    mkdocs_data["nav"].append({"Reference": mkdocs_nav})
-    with mkdocs_cfg_file.open("w") as out_f:
-        yaml.dump(mkdocs_data, out_f, Dumper=yaml.Dumper)
+            print(f"Found {len(issues)} issues in {len(class_irs)} classes")
+        sys.exit(1 if issues else 0)
+
+    if unknown := [
+        f"'{name}' in docstring for '{class_ir['label']}.{member_ir['name']}'"
+        for class_ir in class_irs
+        for member_ir in class_ir["members"]
+        for name in (member_ir["metadata"] or {}).get("unknown_parameters") or []
+    ]:
+        raise click.ClickException(f"Unknown parameters {', '.join(unknown)}")
+
+    print(f"Writing reference to '{ref_dir}'")
+
+    for class_ir in class_irs:
+        label, file_name = class_ir["label"], class_ir["file_name"]
+
+        if section := class_ir["section"]:
+            _entry = {label: f"reference/{file_name}"}
+            mkdocs_sub_navs.setdefault(section, []).append(_entry)
+        else:
+            _entry = {f"The {label} class": f"reference/{file_name}"}
+            mkdocs_nav.append(_entry)
+
+    n_pages_written = write_pages(class_irs, ref_dir, template, rendered)
+
+    if search_index:
+        write_search_index(ref_dir.joinpath("search"), class_irs)
+
+    print(f"{n_pages_written} of {len(class_irs)} pages updated")
+    mkdocs_nav += [{section: entries} for section, entries in mkdocs_sub_navs.items()]
+    write_if_changed(
+        mkdocs_cfg_file, patch_mkdocs_nav(mkdocs_cfg_file.read_text(), mkdocs_nav)
+    )
+
+    if not watch:
+        return
+
+    def _regenerate(targets: list[tuple[TargetConfig, type]], labels: set[str]) -> None:
+        # Links to inherited members depend on every page, otherwise only the
+        # affected classes need to be introspected
+        class_irs, rendered = introspect_classes(
+            targets=(
+                targets
+                if link_inherited
+                else [i for i in targets if i[0]["label"] in labels]
+            ),
+            entry_cache=entry_cache,
+            link_inherited=link_inherited,
+            jobs=jobs,
+            cache_dir=cache_path,
+            documented={module for _, module in targets},
+        )
+        entry_cache.save()
+        updated = [i for i in class_irs if i["label"] in labels]
+        if ir_dir:
+            write_ir(pathlib.Path(ir_dir), updated, ir_format, classes_only=True)
+        write_pages(updated, ref_dir, template, rendered)
+        if search_index:
+            write_search_index(ref_dir.joinpath("search"), updated, partial=True)
+
+    watch_targets(targets, _regenerate)
 
 
 if __name__ in "__main__":